@@ -169,7 +169,11 @@ class AgentResponse(BaseModel):
 class ChatRequest(BaseModel):
     """Request body for POST /agent/chat"""
     session_id: Optional[str] = Field(None, description="Unique session ID. If omitted, starts a new session.")
-    message: Optional[str] = Field(None, description="User's answer to the agent's previous question.")
+    message: Optional[str] = Field(
+        None,
+        description="User's answer to the agent's previous question "
+                    "(a JSON object keyed by field for 'requires_input_bulk')."
+    )
     prompt: Optional[str] = Field(None, description="Initial prompt to start the session (only used if session_id is new).")
     profile: FarmerProfile = Field(default_factory=FarmerProfile, description="Farmer profile data.")
     forced_intent: Optional[str] = Field(None, description="Explicit intent to skip the parsing LLM.")
@@ -179,9 +183,14 @@ class ChatRequest(BaseModel):
 class ChatResponse(BaseModel):
     """Response body from POST /agent/chat"""
     session_id: str
-    status: str = Field(..., description="'requires_input', 'ready_to_submit', 'success', or 'error'")
+    status: str = Field(
+        ..., description="'requires_input', 'requires_input_bulk', 'ready_to_submit', 'success', or 'error'"
+    )
     question: Optional[str] = None
     options: Optional[list[str]] = None
+    fields: Optional[list[dict[str, Any]]] = Field(
+        None, description="Field schema (key, question, options, default) for 'requires_input_bulk'"
+    )
     summary: Optional[dict[str, Any]] = None
     error: Optional[str] = None
 
@@ -436,6 +445,7 @@ async def chat_agent(request: ChatRequest, background_tasks: BackgroundTasks):
             status=response.get("status"),
             question=response.get("question"),
             options=response.get("options"),
+            fields=response.get("fields"),
             summary=response.get("summary"),
             error=response.get("error")
         )
@@ -10,9 +10,12 @@ Improvements:
   - Planned fill/click/select/task steps execute directly (no fake ReAct loop).
   - agentic_loop has iteration limit and per-iteration timeout.
   - user_input_queue.get() has a 5-minute timeout to prevent indefinite blocking.
+  - user_input_queue is a single-slot, future-based hand-off (UserInputSlot)
+    since there is only ever one question outstanding.
 """
 
 import asyncio
+from collections import deque
 
 from ..config.base import SiteConfig
 from ..browser.controller import Browser
@@ -28,6 +31,41 @@ DOM_FETCH_TIMEOUT = 15    # seconds
 LLM_CALL_TIMEOUT = 30    # seconds (not enforced here since reasoning is sync, but documented)
 
 
+class UserInputSlot:
+    """
+    Single-producer / single-consumer channel for user answers.
+
+    The consumer parks on one Future per get(); put() resolves it directly.
+    Answers that arrive while nobody is waiting are buffered in order, so
+    the Queue-style put()/get() contract still holds.
+    """
+
+    def __init__(self):
+        self._waiter: asyncio.Future | None = None
+        self._buffer: deque = deque()
+
+    def put_nowait(self, item) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(item)
+        else:
+            self._buffer.append(item)
+
+    async def put(self, item) -> None:
+        self.put_nowait(item)
+
+    async def get(self):
+        if self._buffer:
+            return self._buffer.popleft()
+        self._waiter = asyncio.get_running_loop().create_future()
+        try:
+            return await self._waiter
+        finally:
+            self._waiter = None
+
+    def empty(self) -> bool:
+        return not self._buffer
+
+
 class Executor:
     """Runs action plans via browser automation and task handlers."""
 
@@ -39,7 +77,7 @@ class Executor:
         self.results = {}
         self._navigator = Navigator(browser, config, verbose=verbose)
         self.reasoning = ReasoningEngine(config, verbose=verbose)
-        self.user_input_queue = asyncio.Queue()
+        self.user_input_queue = UserInputSlot()
         self.agent_output_queue = asyncio.Queue()
         self._current_intent = "get_info"
 
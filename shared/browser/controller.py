@@ -18,6 +18,7 @@ from ..config.base import SiteConfig
 from ..utils import logger
 from ..utils.helpers import wait_for_continue
 from ..utils.vision import VisionHelper
+from .page_helpers import PAGE_HELPERS_JS, call_page_helper
 
 ACTION_DELAY_MIN = 2.0
 ACTION_DELAY_MAX = 3.0
@@ -43,6 +44,7 @@ class Browser:
         self.verbose = verbose
         self._screenshots_dir = Path("screenshots")
         self._screenshots_dir.mkdir(exist_ok=True)
+        self._pending_screenshots: list[asyncio.Task] = []
         self._vision = VisionHelper(verbose=verbose)
 
     async def launch(self) -> Page:
@@ -61,12 +63,29 @@ class Browser:
                 "Chrome/120.0.0.0 Safari/537.36"
             ),
         )
+        # window.__agent helpers (select/fill/wait) in every document
+        await self._context.add_init_script(PAGE_HELPERS_JS)
         self.page = await self._context.new_page()
         logger.success("Browser launched")
         return self.page
 
-    async def navigate(self, url: str) -> None:
-        """Navigate to URL with retry on failure. Adds delay after."""
+    async def open_page(self) -> Page:
+        """
+        Open an extra tab in the browser context (same cookies and page
+        helpers) for work that runs alongside self.page. The caller closes it.
+        """
+        return await self._context.new_page()
+
+    async def navigate(self, url: str, ready_selector: str | None = None,
+                       page: Page | None = None) -> None:
+        """
+        Navigate to URL with retry on failure. Adds delay after. With
+        ready_selector, only DOMContentLoaded is awaited and the page counts
+        as ready once that element is visible, instead of the full load
+        event plus the fixed delay. Acts on self.page unless given a page
+        from open_page().
+        """
+        page = page or self.page
         if not url.startswith("http"):
             url = f"{self.config.base_url}{url}"
 
@@ -76,11 +95,18 @@ class Browser:
         for attempt in range(1, MAX_RETRIES + 1):
             try:
                 logger.step(f"Navigating to {url}")
+                if ready_selector:
+                    await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+                    await page.locator(ready_selector).first.wait_for(
+                        state="visible", timeout=timeout
+                    )
+                    logger.debug(f"Navigation complete (attempt {attempt})", self.verbose)
+                    return
                 try:
-                    await self.page.goto(url, wait_until="load", timeout=timeout)
+                    await page.goto(url, wait_until="load", timeout=timeout)
                 except Exception:
                     logger.debug(f"Full load timed out — retrying with domcontentloaded", self.verbose)
-                    await self.page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+                    await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
                 await asyncio.sleep(delay)
                 logger.debug(f"Navigation complete (attempt {attempt})", self.verbose)
                 return
@@ -140,10 +166,10 @@ class Browser:
         logger.debug(f"Waiting for: {selector}", self.verbose)
         await self.page.wait_for_selector(selector, timeout=timeout)
 
-    async def wait_for_network_idle(self, timeout: int = 10000) -> None:
+    async def wait_for_network_idle(self, timeout: int = 10000, page: Page | None = None) -> None:
         """Wait until network is idle (no pending requests)."""
         try:
-            await self.page.wait_for_load_state("networkidle", timeout=timeout)
+            await (page or self.page).wait_for_load_state("networkidle", timeout=timeout)
         except Exception:
             logger.debug("Network idle timeout — continuing anyway", self.verbose)
 
@@ -168,6 +194,18 @@ class Browser:
         except Exception:
             return ""
 
+    async def get_text_preview(self, limit: int = 400) -> str:
+        """
+        Return the first `limit` characters of the page's visible body text.
+        The slice happens in the browser so only the preview crosses the wire.
+        """
+        try:
+            return await self.page.evaluate(
+                "n => (document.body && document.body.innerText || '').slice(0, n)", limit
+            )
+        except Exception:
+            return ""
+
     async def get_all_text(self, selector: str) -> list[str]:
         """Extract text from all matching elements."""
         elements = await self.page.query_selector_all(selector)
@@ -211,6 +249,48 @@ class Browser:
         logger.info(f"Screenshot saved: {path}")
         return str(path.resolve())
 
+    def screenshot_later(self, name: str = "screenshot") -> None:
+        """
+        Start a screenshot in the background and return immediately.
+        Use when nothing downstream needs the file; call flush_screenshots()
+        before returning results so every PNG is on disk.
+        """
+        self._pending_screenshots.append(asyncio.create_task(self.screenshot(name)))
+
+    async def flush_screenshots(self) -> None:
+        """Wait for all background screenshots started via screenshot_later()."""
+        pending, self._pending_screenshots = self._pending_screenshots, []
+        for result in await asyncio.gather(*pending, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.debug(f"Background screenshot failed: {result}", self.verbose)
+
+    async def download_file(self, url: str, dest: str, timeout: int = 60000) -> str:
+        """
+        Download `url` to `dest` and return the absolute path ("" on failure).
+        Uses the context's request client: async, with the session's cookies
+        and user agent, and one keep-alive connection pool shared by every
+        download, so repeat fetches from a host skip the TCP/TLS handshake.
+        """
+        try:
+            logger.info(f"Downloading: {url}")
+            response = await self._context.request.get(url, timeout=timeout)
+            if not response.ok:
+                raise RuntimeError(f"HTTP {response.status} {response.status_text}")
+            content = await response.body()
+
+            dest_path = Path(dest)
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            dest_path.write_bytes(content)
+
+            size_kb = len(content) // 1024
+            logger.success(f"Downloaded ({size_kb} KB): {dest_path.resolve()}")
+            return str(dest_path.resolve())
+
+        except Exception as e:
+            logger.error(f"Download failed for {url}: {e}")
+            logger.info(f"You can manually download it from:\n  {url}")
+            return ""
+
     async def dismiss_homepage_modal(self) -> None:
         """
         Dismiss homepage modal if the site has one.
@@ -320,9 +400,7 @@ class Browser:
         try:
             locator = self.page.locator(selector).first
             await locator.wait_for(state="visible", timeout=timeout)
-            await locator.click()
-            await locator.fill("")
-            await locator.type(value, delay=60)
+            await locator.fill(value)
             await _delay()
             return True
         except Exception as primary_err:
@@ -355,33 +433,30 @@ class Browser:
         return True
 
     async def vision_select(self, select_idx: int, label: str,
-                            description: str) -> bool:
+                            description: str, settle: float = 3,
+                            wait_ms: int = 0) -> bool:
         """
         Try to set a <select> element by nth() index + JS dispatchEvent.
         If the option is not found, use VLM to locate the dropdown visually.
+        `settle` is the pause after a successful pick; pass 0 when the caller
+        waits on the dependent element itself. With `wait_ms`, the select is
+        first given up to that long to populate, inside the same evaluate.
         """
-        js = f"""
-        (function() {{
-            const sel = document.querySelectorAll('select')[{select_idx}];
-            if (!sel) return 'NO_ELEMENT';
-            const opts = Array.from(sel.options);
-            let match = opts.find(o => o.text.trim().toLowerCase() === "{label.lower()}");
-            if (!match) match = opts.find(
-                o => o.text.trim().toLowerCase().includes("{label.lower()}")
-            );
-            if (match) {{
-                sel.value = match.value;
-                sel.dispatchEvent(new Event('change', {{bubbles: true}}));
-                return 'OK:' + match.text;
-            }}
-            return 'NOT_FOUND:' + opts.map(o => o.text.trim()).join('|');
-        }})()
-        """
+        label_lc = label.lower()
         try:
-            result = await self.page.evaluate(js)
+            if wait_ms:
+                result = await call_page_helper(
+                    self.page, "waitAndSelect", select_idx, label_lc, 2, wait_ms
+                )
+            else:
+                result = await call_page_helper(self.page, "selectByLabel", select_idx, label_lc)
+            if result.startswith("SAME:"):
+                logger.info(f"  Select[{select_idx}] already set to {result[5:]}")
+                return True
             if result.startswith("OK:"):
                 logger.success(f"  Select[{select_idx}] = {result[3:]}")
-                await asyncio.sleep(3)
+                if settle:
+                    await asyncio.sleep(settle)
                 return True
             elif result == "NO_ELEMENT":
                 logger.warning(f"  Select[{select_idx}] does not exist on page")
@@ -410,10 +485,11 @@ class Browser:
             await self.page.mouse.click(x, y)
             await asyncio.sleep(1)
             try:
-                result2 = await self.page.evaluate(js)
-                if result2.startswith("OK:"):
-                    logger.success(f"  Post-vision select[{select_idx}] = {result2[3:]}")
-                    await asyncio.sleep(3)
+                result2 = await call_page_helper(self.page, "selectByLabel", select_idx, label_lc)
+                if result2.startswith(("OK:", "SAME:")):
+                    logger.success(f"  Post-vision select[{select_idx}] = {result2.split(':', 1)[1]}")
+                    if settle:
+                        await asyncio.sleep(settle)
                     return True
             except Exception:
                 pass
@@ -511,29 +587,31 @@ class Browser:
             logger.info(f"Challenge screenshot saved to: {ss_path}")
 
         logger.warning(f"Manual action required: {reason}")
-        wait_for_continue(reason)
+        await asyncio.to_thread(wait_for_continue, reason)
 
         await asyncio.sleep(2)
         logger.success("Resuming automated control...")
         return True
 
-    async def get_page_info(self) -> dict:
+    async def get_page_info(self, page: Page | None = None) -> dict:
         """Get current page title and URL."""
+        page = page or self.page
         return {
-            "url": self.page.url,
-            "title": await self.page.title(),
+            "url": page.url,
+            "title": await page.title(),
         }
 
-    async def get_all_links(self) -> list[dict]:
+    async def get_all_links(self, page: Page | None = None) -> list[dict]:
         """Extract all internal links from the current page."""
         site_domain = self.config.base_url.replace("https://", "").replace("http://", "")
-        links = await self.page.eval_on_selector_all(
+        links = await (page or self.page).eval_on_selector_all(
             "a[href]",
-            f"""els => els.map(el => ({{
+            """(els, domain) => els.map(el => ({
                 text: el.innerText.trim(),
                 href: el.href,
                 title: el.getAttribute('title') || ''
-            }})).filter(l => l.href.includes('{site_domain}') || l.href.startsWith('/'))"""
+            })).filter(l => l.href.includes(domain) || l.href.startsWith('/'))""",
+            site_domain,
         )
         return links
 
@@ -661,6 +739,7 @@ class Browser:
 
     async def close(self) -> None:
         """Clean up browser resources."""
+        await self.flush_screenshots()
         if self._context:
             await self._context.close()
         if self._browser:
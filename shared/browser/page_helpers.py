@@ -0,0 +1,200 @@
+"""
+In-page helper functions shared by the browser controller and task handlers.
+
+PAGE_HELPERS_JS is registered with context.add_init_script() in
+Browser.launch(), so every document gets a `window.__agent` object once and
+each call only ships the helper name and its arguments over CDP instead of
+a full function body.
+"""
+
+from playwright.async_api import Page
+
+
+PAGE_HELPERS_JS = """
+(() => {
+    if (window.__agent) return;
+
+    const PLACEHOLDERS = new Set(['select', '--select--']);  // compared lowercased
+    // Live HTMLCollections, fetched once per document: the engine keeps them
+    // current as the form re-renders, so indexing never re-walks the DOM the
+    // way a fresh querySelectorAll() does.
+    const live = {doc: null, selects: null, inputs: null, buttons: null};
+    const collections = () => {
+        if (live.doc !== document) {
+            live.doc = document;
+            live.selects = document.getElementsByTagName('select');
+            live.inputs = document.getElementsByTagName('input');
+            live.buttons = document.getElementsByTagName('button');
+        }
+        return live;
+    };
+    // Live <select> collections under a scope element (e.g. a modal), keyed
+    // by its CSS selector and re-resolved once that element is detached.
+    const scopes = new Map();
+    const selects = (scope) => {
+        if (!scope) return collections().selects;
+        let entry = scopes.get(scope);
+        if (!entry || !entry.root.isConnected) {
+            const root = document.querySelector(scope);
+            if (!root) return [];
+            entry = {root, selects: root.getElementsByTagName('select')};
+            scopes.set(scope, entry);
+        }
+        return entry.selects;
+    };
+    const inputs = () => collections().inputs;
+    const buttons = () => collections().buttons;
+
+    // Trimmed and lowercased option texts of a <select>, read fresh on each
+    // call: React lists keyed by index keep their <option> nodes and rewrite
+    // the text, so a cache keyed on the nodes could go stale unnoticed.
+    const optionInfo = (sel) => {
+        const texts = Array.from(sel.options, o => o.text.trim());
+        const lower = texts.map(t => t.toLowerCase());
+        return {
+            texts, lower,
+            visible: texts.filter((t, i) => t && !PLACEHOLDERS.has(lower[i])),
+        };
+    };
+    const optionTexts = (sel) => optionInfo(sel).visible;
+
+    window.__agent = {
+        // Helpers taking a trailing `scope` (CSS selector) index the selects
+        // inside that element instead of the whole document.
+
+        // Pick the nth <select>'s option by label (exact, then substring;
+        // label is pre-lowercased) and fire input + change, as
+        // select_option() does, so React's onChange sees the pick.
+        // Returns 'OK:<text>', 'SAME:<text>' (already selected: no events,
+        // so no cascade reload), 'NO_ELEMENT' or 'NOT_FOUND:<opt|opt|...>'.
+        selectByLabel(idx, label, scope) {
+            const sel = selects(scope)[idx];
+            if (!sel) return 'NO_ELEMENT';
+            const {texts, lower} = optionInfo(sel);
+            let i = lower.indexOf(label);
+            if (i < 0) i = lower.findIndex(t => t.includes(label));
+            if (i >= 0) {
+                const match = sel.options[i];
+                if (sel.selectedIndex === i) return 'SAME:' + match.text;
+                sel.value = match.value;
+                sel.dispatchEvent(new Event('input', {bubbles: true}));
+                sel.dispatchEvent(new Event('change', {bubbles: true}));
+                return 'OK:' + match.text;
+            }
+            return 'NOT_FOUND:' + texts.join('|');
+        },
+
+        // Resolve with the nth <select>'s option texts once it has minCount
+        // options (MutationObserver, no polling); null after timeoutMs.
+        waitForOptions(idx, minCount, timeoutMs, scope) {
+            return new Promise(resolve => {
+                const ready = () => {
+                    const sel = selects(scope)[idx];
+                    return sel && sel.options.length >= minCount ? optionTexts(sel) : null;
+                };
+                const initial = ready();
+                if (initial) return resolve(initial);
+                const observer = new MutationObserver(() => {
+                    const opts = ready();
+                    if (opts) { observer.disconnect(); clearTimeout(timer); resolve(opts); }
+                });
+                const timer = setTimeout(() => { observer.disconnect(); resolve(null); }, timeoutMs);
+                observer.observe(document.body, {subtree: true, childList: true});
+            });
+        },
+
+        // selectByLabel, then (if the pick landed) waitForOptions on the
+        // next cascade level. Returns {result, next: option texts | null}.
+        async selectAndWait(idx, label, nextIdx, minCount, timeoutMs, scope) {
+            const result = window.__agent.selectByLabel(idx, label, scope);
+            const picked = result.startsWith('OK:') || result.startsWith('SAME:');
+            const next = picked
+                ? await window.__agent.waitForOptions(nextIdx, minCount, timeoutMs, scope)
+                : null;
+            return {result, next};
+        },
+
+        // waitForOptions + selectByLabel in one call: picks the label the
+        // moment the options land (tries anyway if they never do).
+        async waitAndSelect(idx, label, minCount, timeoutMs, scope) {
+            await window.__agent.waitForOptions(idx, minCount, timeoutMs, scope);
+            return window.__agent.selectByLabel(idx, label, scope);
+        },
+
+        // Option texts of the <select>s at the given indices (all of them
+        // when indices is null), placeholders dropped; [] for a missing index.
+        snapshotSelects(indices, scope) {
+            const all = selects(scope);
+            if (indices == null) return Array.from(all).map(optionTexts);
+            return indices.map(i => all[i] ? optionTexts(all[i]) : []);
+        },
+
+        // One-trip page state: URL, select/input counts, the option texts of
+        // the selects at `indices` (as snapshotSelects) and, for each
+        // {name: cssSelector} probe, whether its first match is visible.
+        pageSnapshot(indices, probes) {
+            const visible = {};
+            for (const [name, css] of Object.entries(probes || {})) {
+                const el = document.querySelector(css);
+                visible[name] = !!el && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+            }
+            return {
+                url: location.href,
+                selectCount: selects().length,
+                inputCount: inputs().length,
+                selects: window.__agent.snapshotSelects(indices),
+                visible,
+            };
+        },
+
+        // Index of the first <button> whose text equals one of `labels`
+        // (pre-lowercased), else contains one; with submitFallback, the
+        // first type=submit button. -1 if none, so the caller can click
+        // locator('button').nth(idx) without a text-matching selector.
+        buttonIndex(labels, submitFallback) {
+            const all = Array.from(buttons());
+            const texts = all.map(b => b.innerText.trim().toLowerCase());
+            let i = texts.findIndex(t => labels.includes(t));
+            if (i < 0) i = texts.findIndex(t => labels.some(l => t.includes(l)));
+            if (i < 0 && submitFallback) i = all.findIndex(b => b.type === 'submit');
+            return i;
+        },
+
+        // Set each [idx, value] input through the native value setter so
+        // React's change tracking sees it, then fire input/change.
+        // Returns the indices whose value did not stick.
+        bulkFill(pairs) {
+            const all = inputs();
+            const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+            const failed = [];
+            for (const [i, v] of pairs) {
+                const el = all[i];
+                if (!el) { failed.push(i); continue; }
+                el.focus();
+                setValue.call(el, v);
+                el.dispatchEvent(new Event('input', {bubbles: true}));
+                el.dispatchEvent(new Event('change', {bubbles: true}));
+                el.blur();
+                if (el.value !== v) failed.push(i);
+            }
+            return failed;
+        },
+    };
+})();
+"""
+
+_MISSING = "__agent_missing__"
+_CALL_JS = f"([name, args]) => window.__agent ? window.__agent[name](...args) : '{_MISSING}'"
+
+
+async def call_page_helper(page: Page, name: str, *args):
+    """
+    Call window.__agent[name](*args) in the page. Installs the helpers first
+    if the document predates the init script (e.g. a page not created by
+    Browser.launch).
+    """
+    result = await page.evaluate(_CALL_JS, [name, list(args)])
+    if result == _MISSING:
+        await page.evaluate(PAGE_HELPERS_JS)
+        result = await page.evaluate(_CALL_JS, [name, list(args)])
+    return result
@@ -1,5 +1,9 @@
 from . import logger
-from .helpers import prompt_user, prompt_confirm, wait_for_continue, save_json, display_table, display_result
+from .helpers import (
+    prompt_user, prompt_confirm, prompt_user_async, prompt_confirm_async,
+    wait_for_continue, save_json, display_table, display_result,
+)
+from .matching import smart_match
 from .user_profile import UserProfile, run_setup_wizard
 from .vision import VisionHelper
 
@@ -7,10 +11,13 @@ __all__ = [
     "logger",
     "prompt_user",
     "prompt_confirm",
+    "prompt_user_async",
+    "prompt_confirm_async",
     "wait_for_continue",
     "save_json",
     "display_table",
     "display_result",
+    "smart_match",
     "UserProfile",
     "run_setup_wizard",
     "VisionHelper",
@@ -2,6 +2,7 @@
 Helper utilities for CLI interaction, JSON output, and data display.
 """
 
+import asyncio
 import json
 import getpass
 from pathlib import Path
@@ -28,6 +29,16 @@ def prompt_confirm(question: str, default: bool = True) -> bool:
     return answer in ("y", "yes")
 
 
+async def prompt_user_async(question: str, secret: bool = False, default: str = "") -> str:
+    """prompt_user() run in a worker thread so the event loop keeps running."""
+    return await asyncio.to_thread(prompt_user, question, secret, default)
+
+
+async def prompt_confirm_async(question: str, default: bool = True) -> bool:
+    """prompt_confirm() run in a worker thread so the event loop keeps running."""
+    return await asyncio.to_thread(prompt_confirm, question, default)
+
+
 def wait_for_continue(reason: str = "") -> None:
     """
     Hand off control to user. Blocks until user types 'continue'.
@@ -0,0 +1,188 @@
+"""
+Option matching for dropdown selection.
+
+smart_match() maps a user- or profile-supplied label onto one of a select's
+option texts (exact → acronym → phonetic → typo → partial → token overlap),
+or returns None when the value is not in the list so the caller can stop and
+show the options. RapidFuzz and metaphone are optional; without them the
+typo and phonetic passes are skipped.
+"""
+
+import re
+from difflib import SequenceMatcher
+from functools import lru_cache
+
+try:
+    from rapidfuzz import fuzz, process, utils as fuzz_utils
+except ImportError:  # optional: the typo pass is skipped
+    process = None
+
+try:
+    from metaphone import doublemetaphone
+except ImportError:  # optional: the phonetic pass is skipped
+    doublemetaphone = None
+
+
+_LOWER_WORD_RE = re.compile(r"[a-z]+")
+# WRatio score a typo match needs, and its lead over the next-best option
+_FUZZY_CUTOFF = 88
+_FUZZY_MARGIN = 5
+# Spelling similarity a same-sounding option needs ("Mango" and "Moong"
+# share a Double Metaphone code but are different crops)
+_PHONETIC_MIN_RATIO = 0.75
+
+
+def _initials(phrase: str) -> str:
+    """
+    Upper-case initial letters of the words in 'phrase' ("Pradhan Mantri
+    ..." → "PM..."). A word is a run of letters; one pass, no regex.
+    """
+    initials = []
+    prev_alpha = False
+    for ch in phrase:
+        is_alpha = ch.isalpha()
+        if is_alpha and not prev_alpha:
+            initials.append(ch)
+        prev_alpha = is_alpha
+    return "".join(initials).upper()
+
+
+def _acronym_of(abbr: str, phrase: str) -> bool:
+    """
+    Return True if 'abbr' is an acronym (initial letters) of 'phrase'.
+    E.g. "PMFBY" matches "Pradhan Mantri Fasal Bima Yojana"
+    """
+    return abbr.upper() == _initials(phrase)
+
+
+@lru_cache(maxsize=32)
+def _option_index(options: tuple[str, ...]) -> tuple[dict[str, str], tuple[str, ...]]:
+    """
+    Casefolded forms of an option list, built once per distinct list:
+    ({casefolded: first option with it}, casefolded options in order).
+    The same list is usually matched more than once (e.g. the Scheme check
+    and its selection), so repeat lookups skip the normalisation.
+    """
+    norm = tuple(opt.casefold() for opt in options)
+    exact = {}
+    for opt, opt_fold in zip(options, norm):
+        exact.setdefault(opt_fold, opt)
+    return exact, norm
+
+
+@lru_cache(maxsize=32)
+def _acronym_index(options: tuple[str, ...]) -> dict[str, str]:
+    """
+    Map the initials of each option to the first option having them
+    ("PMFBY" → "Pradhan Mantri Fasal Bima Yojana"), built once per list.
+    """
+    acronyms = {}
+    for opt in options:
+        acronyms.setdefault(_initials(opt), opt)
+    return acronyms
+
+
+@lru_cache(maxsize=32)
+def _phonetic_index(options: tuple[str, ...]) -> dict[str, str | None]:
+    """
+    Map each Double Metaphone code (primary and alternate) of the options
+    to the option having it, or None when several options share the code,
+    built once per list.
+    """
+    codes = {}
+    for opt in options:
+        for code in set(doublemetaphone(opt)):
+            if code:
+                codes[code] = None if codes.get(code, opt) != opt else opt
+    return codes
+
+
+@lru_cache(maxsize=32)
+def _token_index(norm: tuple[str, ...]) -> dict[str, int]:
+    """
+    Map each meaningful word (>3 chars) of the casefolded options to the
+    index of the first option containing it. Only labels no earlier pass
+    matched need it, so it is built (once per list) on first use.
+    """
+    first_with = {}
+    for i, opt_lower in enumerate(norm):
+        for tok in _LOWER_WORD_RE.findall(opt_lower):
+            if len(tok) > 3:
+                first_with.setdefault(tok, i)
+    return first_with
+
+
+def smart_match(label: str, options: list[str]) -> str | None:
+    """
+    Find the best match for 'label' in 'options' using a priority chain:
+      1. Exact match (case-insensitive)
+      2. Acronym match (e.g. "PMFBY" → "Pradhan Mantri Fasal Bima Yojana")
+      3. Phonetic match — the only option sounding like the label
+         ("Madhurai" → "Madurai"), when metaphone is installed
+      4. Typo match — RapidFuzz WRatio (e.g. "Maharastra"), when installed;
+         only a near-certain, unambiguous score counts
+      5. Partial / substring match, then token overlap (any word in label
+         appears in option)
+
+    A value that is not in the list must come back None, so callers can
+    abort and list the options: the typo pass would otherwise map "Tomato"
+    onto "Potato" or "2026" onto "2024".
+
+    Options are expected trimmed (the page helpers return them so); case is
+    folded with casefold(), which also covers non-Latin scripts.
+    Returns the matched option string, or None if no match.
+    """
+    lw = label.strip().casefold()
+    abbr = label.strip().upper()
+    # Only a short single word can be an acronym; skip initials otherwise
+    check_acronym = abbr.isalpha() and len(abbr) <= 8
+
+    # 1. Exact — a dict lookup, so canonical values (profile data, the
+    # hardcoded scheme name) never reach the scoring passes
+    options_key = tuple(options)
+    exact, norm = _option_index(options_key)
+    hit = exact.get(lw)
+    if hit is not None:
+        return hit
+
+    # 2. Acronym
+    if check_acronym:
+        hit = _acronym_index(options_key).get(abbr)
+        if hit is not None:
+            return hit
+
+    # 3. Phonetic — only a code no other option shares counts, so
+    # same-sounding neighbours (Double Metaphone keeps 4 letters) are left
+    # to the fuzzy scorer, and the spelling must still be close
+    if doublemetaphone is not None:
+        phonetic = _phonetic_index(options_key)
+        for code in doublemetaphone(label.strip()):
+            hit = phonetic.get(code) if code else None
+            if hit is not None and \
+                    SequenceMatcher(None, lw, hit.casefold()).ratio() >= _PHONETIC_MIN_RATIO:
+                return hit
+
+    # 4. Typo — a high score, clear of any runner-up that is a different
+    # option
+    if process is not None:
+        best = process.extract(
+            lw, norm, scorer=fuzz.WRatio, processor=fuzz_utils.default_process,
+            limit=2, score_cutoff=_FUZZY_CUTOFF,
+        )
+        if best and (
+            len(best) == 1
+            or best[0][0] == best[1][0]
+            or best[0][1] - best[1][1] >= _FUZZY_MARGIN
+        ):
+            return options[best[0][2]]
+
+    # 5. Partial (label is substring of option, or option is substring of label)
+    for i, opt_lower in enumerate(norm):
+        if lw in opt_lower or opt_lower in lw:
+            return options[i]
+
+    # Token overlap — first option sharing a meaningful word (>3 chars) with
+    # the label
+    first_with = _token_index(norm)
+    hits = [first_with[w] for w in _LOWER_WORD_RE.findall(lw) if w in first_with]
+    return options[min(hits)] if hits else None
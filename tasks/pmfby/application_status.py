@@ -10,16 +10,24 @@ KEY FINDINGS:
 - Submit button: button:has-text('Check Status')
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 import asyncio
 from playwright.async_api import Page
 
 from shared.browser.controller import Browser
 from shared.utils import logger
-from shared.utils.helpers import prompt_user
+from shared.utils.helpers import prompt_user_async
+
+# ── Homepage modal selectors ───────────────────────────────────────────────
+
+SEL_SERVICE_CARD = '[class*="ciListBtn"]'
+SEL_MODAL_INPUT = '.modal-body input, [class*="InnerCalculator"] input'
+SEL_CHECK_STATUS = "button:has-text('Check Status')"
+RESULT_SELECTORS = [
+    '.modal-body table',
+    '[class*="InnerCalculator"] table',
+    '.modal-body .result',
+    '.modal-body',
+]
 
 
 class ApplicationStatusTask:
@@ -37,34 +45,34 @@ class ApplicationStatusTask:
         logger.section("Application Status Check")
         logger.info("Opening the Application Status modal on the homepage.\n")
 
-        page = self.browser.page
+        browser = self.browser
+        page = browser.page
 
         # ── Navigate and open modal ──────────────────────────────────────
-        await self.browser.navigate("https://pmfby.gov.in/")
+        await browser.navigate("https://pmfby.gov.in/")
         await asyncio.sleep(3)
 
         logger.step("Clicking 'Application Status' service card (index 2)...")
         try:
-            card = page.locator('[class*="ciListBtn"]').nth(2)
+            card = page.locator(SEL_SERVICE_CARD).nth(2)
             await card.wait_for(state="visible", timeout=8000)
             await card.click()
-            await asyncio.sleep(3)
             logger.success("Application Status modal opened")
         except Exception as e:
             logger.error(f"Could not open Application Status modal: {e}")
             return {"task": "check_status", "status": "failed", "error": str(e)}
 
-        # Wait for modal to appear
+        # Modal is ready as soon as its first input is in the DOM
         try:
-            await page.wait_for_selector('.modal-dialog, [class*="InnerCalculator"]', timeout=8000)
+            await page.locator(SEL_MODAL_INPUT).first.wait_for(state="attached", timeout=10000)
         except Exception:
-            logger.warning("Modal selector timeout — continuing")
+            logger.warning("Modal input timeout — continuing")
 
         # ── Get receipt/policy number ────────────────────────────────────
         receipt_number = (
             pre_params.get("receipt_number")
             or pre_params.get("policy_id")
-            or prompt_user("Enter Policy ID / Receipt Number")
+            or await prompt_user_async("Enter Policy ID / Receipt Number")
         )
         if not receipt_number:
             logger.error("No Policy ID provided.")
@@ -74,23 +82,21 @@ class ApplicationStatusTask:
         logger.step(f"Entering Policy ID: {receipt_number}")
         try:
             # Policy ID input is the FIRST input inside the modal
-            policy_input = page.locator('.modal-body input, [class*="InnerCalculator"] input').nth(0)
+            policy_input = page.locator(SEL_MODAL_INPUT).nth(0)
             await policy_input.wait_for(state="visible", timeout=8000)
-            await policy_input.click()
-            await policy_input.fill("")
-            await policy_input.type(receipt_number, delay=60)
+            await policy_input.fill(receipt_number)
             logger.success(f"Entered Policy ID: {receipt_number}")
         except Exception as e:
             logger.warning(f"Could not fill Policy ID field: {e}")
-            await self.browser.handoff_to_user(
+            await browser.handoff_to_user(
                 f"Please enter '{receipt_number}' in the Policy ID field, "
                 "then type 'continue'."
             )
 
         # ── CAPTCHA — always requires user handoff ────────────────────────
         logger.warning("CAPTCHA is required for Application Status. Handing off to user.")
-        await self.browser.screenshot("status_captcha")
-        await self.browser.handoff_to_user(
+        browser.screenshot_later("status_captcha")
+        await browser.handoff_to_user(
             "Please solve the CAPTCHA displayed in the browser (a Security Code image), "
             "enter it in the CAPTCHA field, then type 'continue'."
         )
@@ -98,27 +104,21 @@ class ApplicationStatusTask:
         # ── Click Check Status ────────────────────────────────────────────
         logger.step("Clicking 'Check Status' button...")
         try:
-            check_btn = page.locator("button:has-text('Check Status')")
+            check_btn = page.locator(SEL_CHECK_STATUS)
             await check_btn.wait_for(state="visible", timeout=6000)
             await check_btn.click()
             await asyncio.sleep(5)
             logger.success("Check Status submitted")
         except Exception as e:
             logger.warning(f"Check Status button error: {e}")
-            await self.browser.handoff_to_user(
+            await browser.handoff_to_user(
                 "Please click 'Check Status' manually, then type 'continue'."
             )
 
         # ── Extract result ─────────────────────────────────────────────────
         await asyncio.sleep(3)
         result_text = ""
-        result_selectors = [
-            '.modal-body table',
-            '[class*="InnerCalculator"] table',
-            '.modal-body .result',
-            '.modal-body',
-        ]
-        for sel in result_selectors:
+        for sel in RESULT_SELECTORS:
             try:
                 txt = await page.inner_text(sel)
                 if txt and len(txt.strip()) > 20:
@@ -129,13 +129,13 @@ class ApplicationStatusTask:
 
         if result_text:
             logger.section("Application Status Result")
-            for line in result_text.split("\n")[:25]:
-                if line.strip():
-                    logger.info(f"  {line.strip()}")
+            lines = [f"  {line.strip()}" for line in result_text.split("\n")[:25] if line.strip()]
+            logger.info("\n".join(lines))
         else:
             logger.warning("Could not auto-extract result — check the browser window.")
 
-        await self.browser.screenshot("application_status_result")
+        browser.screenshot_later("application_status_result")
+        await browser.flush_screenshots()
 
         return {
             "task": "check_status",
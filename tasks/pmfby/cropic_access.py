@@ -10,15 +10,11 @@ KEY FINDINGS:
 - Status tracking: Reference ID-based, available post-login
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 import asyncio
 
 from shared.browser.controller import Browser
 from shared.utils import logger
-from shared.utils.helpers import prompt_user, prompt_confirm
+from shared.utils.helpers import prompt_user_async
 
 CROPIC_URL = "https://pmfby.gov.in/cropic/"
 
@@ -52,7 +48,7 @@ class CROPICAccessTask:
         mobile = (
             pre_params.get("cropic_mobile")
             or pre_params.get("mobile")
-            or prompt_user("CROPIC Registered Mobile Number")
+            or await prompt_user_async("CROPIC Registered Mobile Number")
         )
         if mobile:
             # Try dynamic React id first, then fallback to type/label
@@ -63,7 +59,7 @@ class CROPICAccessTask:
             )
 
         # Password
-        password = pre_params.get("cropic_password") or prompt_user("CROPIC Password")
+        password = pre_params.get("cropic_password") or await prompt_user_async("CROPIC Password")
         if password:
             await self.browser.vision_fill(
                 "input[type='password'], input[id=':r3:']",
@@ -77,7 +73,7 @@ class CROPICAccessTask:
             await self.browser.handle_captcha()
         else:
             # CROPIC captcha may not be image-based — try to find text captcha
-            captcha_val = prompt_user("Enter the CAPTCHA code shown in the CROPIC browser")
+            captcha_val = await prompt_user_async("Enter the CAPTCHA code shown in the CROPIC browser")
             if captcha_val:
                 await self.browser.vision_fill(
                     "input[placeholder*='aptcha'], input[id=':r4:']",
@@ -100,13 +96,13 @@ class CROPICAccessTask:
 
         await self.browser.screenshot("cropic_login_result")
 
-        body = await self.browser.get_text("body")
+        body = await self.browser.get_text_preview(400)
         return {
             "task": "cropic_access",
             "action": "login",
             "mobile": mobile or "",
             "status": "completed",
-            "result_preview": body[:400] if body else "See cropic_login_result.png",
+            "result_preview": body or "See cropic_login_result.png",
         }
 
     # ── Photo Upload ──────────────────────────────────────────────────────────
@@ -138,7 +134,7 @@ class CROPICAccessTask:
         policy_id = (
             pre_params.get("policy_id")
             or pre_params.get("receipt_number")
-            or prompt_user("Policy ID / Application Number for photo linkage")
+            or await prompt_user_async("Policy ID / Application Number for photo linkage")
         )
         if policy_id:
             await self.browser.vision_fill(
@@ -176,13 +172,13 @@ class CROPICAccessTask:
 
         await self.browser.screenshot("cropic_upload_result")
 
-        body = await self.browser.get_text("body")
+        body = await self.browser.get_text_preview(400)
         return {
             "task": "cropic_access",
             "action": "upload_photo",
             "policy_id": policy_id or "",
             "status": "completed",
-            "result_preview": body[:400] if body else "See cropic_upload_result.png",
+            "result_preview": body or "See cropic_upload_result.png",
         }
 
     # ── Track Status ──────────────────────────────────────────────────────────
@@ -213,7 +209,7 @@ class CROPICAccessTask:
         ref_id = (
             pre_params.get("reference_id")
             or pre_params.get("policy_id")
-            or prompt_user("Enter Reference ID or Policy ID to track")
+            or await prompt_user_async("Enter Reference ID or Policy ID to track")
         )
         if ref_id:
             await self.browser.vision_fill(
@@ -14,108 +14,221 @@ from the input queue.
 """
 
 import asyncio
-from playwright.async_api import Page
-
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import json
+from typing import Callable
+from playwright.async_api import ElementHandle, Locator, Page
 
 from shared.browser.controller import Browser
-from shared.utils import logger
+from shared.browser.page_helpers import call_page_helper
+from shared.utils import logger, prompt_user_async
+from shared.utils.matching import smart_match
 
 
 # ── Helpers ────────────────────────────────────────────────────────────────
 
 USER_INPUT_TIMEOUT = 300  # 5 minutes max wait for user answer
 
+VERIFY_BUTTON_LABELS = ["verify"]
+SUBMIT_BUTTON_LABELS = ["create user"]
+SEL_SERVICE_CARD = '[class*="ciListBtn"]'
+# CSS4 'i' flag: one case-insensitive match instead of a 'OTP, otp' union
+SEL_OTP_INPUT = "input[placeholder*='otp' i]"
+SEL_CAPTCHA_INPUT = "input[placeholder*='captcha' i]"
+_PLACEHOLDERS = {"select", "--select--"}  # lowercased placeholder option texts
+
 
 async def _wait_for_options(page: Page, select_idx: int,
-                            min_count: int = 2, timeout_ms: int = 12000) -> None:
-    """Wait until the nth select element has at least min_count options (AJAX loads)."""
+                            min_count: int = 2, timeout_ms: int = 12000) -> list[str]:
+    """
+    Wait until the nth select element has at least min_count options (AJAX
+    loads) and return its option texts, or [] on timeout.
+    """
     try:
-        await page.wait_for_function(
-            f"document.querySelectorAll('select')[{select_idx}].options.length >= {min_count}",
-            timeout=timeout_ms,
-        )
+        opts = await call_page_helper(page, "waitForOptions", select_idx, min_count, timeout_ms)
     except Exception:
+        opts = None
+    if opts is None:
         logger.warning(f"Timeout waiting for select[{select_idx}] to populate — continuing anyway")
+        return []
+    return opts
 
 
-async def _select_nth_by_label(page: Page, select_idx: int, label: str) -> bool:
+async def _select_nth_by_label(page: Page, select_idx: int, label: str,
+                               wait_ms: int = 0) -> bool:
     """
-    Select the option in the Nth <select> element whose text matches label (fuzzy).
-    Returns True if successful.
+    Select the option in the Nth <select> element whose text matches label
+    via Playwright's select_option (actionability checks, input + change
+    events). The option is resolved in Python against the select's texts:
+    case-insensitive exact, then substring, then smart_match (acronyms,
+    token overlap). With wait_ms, first wait that long for the select to
+    populate. A select already showing the option is left alone (no change
+    event, so no cascade reload). Safe to run concurrently — it never
+    touches the mouse or screenshots. Returns True if successful.
     """
+    select = page.locator("select").nth(select_idx)
     try:
-        js = f"""
-        (function() {{
-            const sel = document.querySelectorAll('select')[{select_idx}];
-            if (!sel) return false;
-            const opts = Array.from(sel.options);
-            // Exact match
-            let match = opts.find(o => o.text.trim().toLowerCase() === "{label.lower()}");
-            // Partial match if no exact
-            if (!match) match = opts.find(o => o.text.trim().toLowerCase().includes("{label.lower()}"));
-            if (match) {{
-                sel.value = match.value;
-                sel.dispatchEvent(new Event('change', {{bubbles: true}}));
-                return match.text;
-            }}
-            return false;
-        }})()
-        """
-        result = await page.evaluate(js)
-        if result:
-            logger.success(f"  Selected select[{select_idx}]: {result}")
-            await asyncio.sleep(3)  # Wait for AJAX cascade
-            return True
+        if wait_ms:
+            await _wait_for_options(page, select_idx, min_count=2, timeout_ms=wait_ms)
+        texts = [t.strip() for t in await select.locator("option").all_text_contents()]
+        lower = [t.lower() for t in texts]
+        label_lc = label.strip().lower()
+        if label_lc in lower:
+            i = lower.index(label_lc)
         else:
+            i = next((i for i, t in enumerate(lower) if label_lc in t), -1)
+        if i < 0:
+            match = smart_match(label, [t for t in texts if t and t.lower() not in _PLACEHOLDERS])
+            i = texts.index(match) if match else -1
+        if i < 0:
             logger.warning(f"  No match for '{label}' in select[{select_idx}]")
             return False
+        if await select.evaluate("s => s.selectedIndex") == i:
+            logger.info(f"  Select[{select_idx}] already set to {texts[i]}")
+            return True
+        await select.select_option(index=i, timeout=3000)
+        logger.success(f"  Select[{select_idx}] = {texts[i]}")
+        return True
     except Exception as e:
         logger.warning(f"  select[{select_idx}] error: {e}")
         return False
 
 
-async def _fill_nth_input(page: Page, input_idx: int, value: str) -> None:
-    """Fill the Nth <input> element on the page."""
+async def _find_button(page: Page, labels: list[str],
+                       submit_fallback: bool = False) -> Locator | None:
+    """
+    Locate a <button> by its text (exact, then substring; labels lowercase)
+    with one evaluate over the live button collection, and return it as an
+    nth() locator, or None if there is no such button.
+    """
+    try:
+        idx = await call_page_helper(page, "buttonIndex", labels, submit_fallback)
+    except Exception:
+        return None
+    return page.locator("button").nth(idx) if idx >= 0 else None
+
+
+async def _fill_nth_input(page: Page, input_idx: int, value: str, slow: bool = False,
+                          handles: list[ElementHandle] | None = None) -> None:
+    """
+    Fill the Nth <input> element on the page with fill(). If the field does
+    not end up holding the value (masked/validated inputs), or slow=True,
+    type it key by key instead. Pass handles (a snapshot of
+    page.locator("input").element_handles()) to skip re-querying the DOM.
+    fill() does its own actionability wait and scroll, so no separate
+    wait_for()/scrollIntoView round-trips are made.
+    """
     try:
-        locator = page.locator("input").nth(input_idx)
-        await locator.wait_for(state="visible", timeout=5000)
-        await locator.click()
-        await locator.fill("")
-        await locator.type(value, delay=60)
-        await asyncio.sleep(1)
+        if handles is not None and input_idx < len(handles):
+            locator = handles[input_idx]
+        else:
+            locator = page.locator("input").nth(input_idx)
+        if not slow:
+            await locator.fill(value)
+            slow = await locator.input_value() != value
+        if slow:
+            await locator.fill("")
+            if isinstance(locator, ElementHandle):
+                await locator.type(value, delay=20)  # handles have no press_sequentially
+            else:
+                await locator.press_sequentially(value, delay=20)
         logger.debug(f"  Filled input[{input_idx}]: {value[:30]}", verbose=True)
     except Exception as e:
         logger.warning(f"  Could not fill input[{input_idx}]: {e}")
 
 
-async def _list_nth_select_options(page: Page, select_idx: int) -> list:
-    """Return the option texts of the Nth select element."""
+async def _fill_inputs_bulk(page: Page, pairs: list[tuple[int, str]]) -> None:
+    """
+    Fill several nth() inputs in one evaluate. Any input the batch could not
+    set is retried individually with _fill_nth_input(slow=True) (real keystrokes).
+    """
+    if not pairs:
+        return
     try:
-        js = f"""
-        Array.from(document.querySelectorAll('select')[{select_idx}].options)
-             .map(o => o.text.trim()).filter(t => t && t !== 'Select' && t !== '--Select--')
-        """
-        return await page.evaluate(js)
+        failed = await call_page_helper(page, "bulkFill", [[idx, value] for idx, value in pairs])
+    except Exception as e:
+        logger.warning(f"  Bulk fill failed ({e}) — filling inputs one by one")
+        failed = [idx for idx, _ in pairs]
+    logger.debug(f"  Bulk-filled {len(pairs) - len(failed)}/{len(pairs)} inputs", verbose=True)
+    if not failed:
+        return
+    values = dict(pairs)
+    handles = await page.locator("input").element_handles()
+    try:
+        for idx in failed:
+            await _fill_nth_input(page, idx, values[idx], slow=True, handles=handles)
+    finally:
+        await asyncio.gather(*(h.dispose() for h in handles), return_exceptions=True)
+
+
+# Clicks the Farmer Corner card, waits for the "Guest Farmer" entry to appear
+# and clicks it. Returns 'OK', 'NO_CARD' or 'NO_GUEST_FARMER'.
+_OPEN_GUEST_FARMER_JS = """
+(timeoutMs) => new Promise(resolve => {
+    const card = document.querySelectorAll('[class*="ciListBtn"]')[0];
+    if (!card) return resolve('NO_CARD');
+    // Innermost element whose whole text is "Guest Farmer" (document order
+    // puts descendants after their ancestors, so take the last match)
+    const findGuest = () => Array.from(document.querySelectorAll('button, a, li, div, span'))
+        .filter(e => e.textContent.trim() === 'Guest Farmer').pop();
+    const clickGuest = (el) => {
+        observer.disconnect();
+        clearTimeout(timer);
+        el.click();
+        resolve('OK');
+    };
+    const observer = new MutationObserver(() => {
+        const el = findGuest();
+        if (el) clickGuest(el);
+    });
+    const timer = setTimeout(() => { observer.disconnect(); resolve('NO_GUEST_FARMER'); }, timeoutMs);
+    observer.observe(document.body, {subtree: true, childList: true, attributes: true});
+    card.click();
+    const el = findGuest();
+    if (el) clickGuest(el);
+})
+"""
+
+
+async def _page_snapshot(page: Page, indices: list[int] | None = None,
+                         probes: dict[str, str] | None = None) -> dict:
+    """
+    Read the page state the flow branches on in one evaluate round-trip:
+    url, selectCount, inputCount, selects (option texts of the selects at
+    `indices`, or every select if None, keyed by index; placeholders
+    dropped) and visible ({probe name: bool} for each CSS selector probe).
+    """
+    try:
+        snap = await call_page_helper(page, "pageSnapshot", indices, probes or {})
     except Exception:
-        return []
+        return {"url": page.url, "selectCount": 0, "inputCount": 0, "selects": {}, "visible": {}}
+    opts = snap["selects"]
+    snap["selects"] = dict(zip(indices, opts)) if indices is not None else dict(enumerate(opts))
+    return snap
 
 
 # ── Queue-based I/O ────────────────────────────────────────────────────────
 
 async def _ask_user(output_queue: asyncio.Queue, input_queue: asyncio.Queue,
-                    question: str, options: list = None) -> str:
+                    question: str, options: list = None,
+                    status: str = "requires_input", summary: dict = None) -> str:
     """
     Yield an ASK_USER message to the output queue and wait for the user's
     answer from the input queue. Used as a drop-in replacement for prompt_user().
+    A summary (e.g. with status="ready_to_submit") rides along in the same message.
+    Without queues (standalone run) the question goes to the CLI instead.
     """
+    if output_queue is None:
+        if options:
+            logger.info(f"Available options: {options}")
+        return await prompt_user_async(question)
+
     msg = {
-        "status": "requires_input",
+        "status": status,
         "question": question,
         "options": options or []
     }
+    if summary is not None:
+        msg["summary"] = summary
     await output_queue.put(msg)
     logger.info(f"Asking user: {question}")
 
@@ -129,27 +242,121 @@ async def _ask_user(output_queue: asyncio.Queue, input_queue: asyncio.Queue,
     return str(answer).strip()
 
 
-async def _ask_confirm(output_queue: asyncio.Queue, input_queue: asyncio.Queue,
-                       question: str) -> bool:
+async def _ask_user_bulk(output_queue: asyncio.Queue, input_queue: asyncio.Queue,
+                         fields: list[dict]) -> dict:
     """
-    Yield a yes/no confirmation question and return True if the user confirms.
+    Ask for several fields in one round-trip. Yields a requires_input_bulk
+    message listing every field and expects a dict (or JSON object string)
+    keyed by each field's "key". Returns {} if the reply is not an object
+    (or there are no queues), so the caller asks field by field instead.
     """
-    answer = await _ask_user(output_queue, input_queue, question, options=["Yes", "No"])
-    return answer.lower() in ("yes", "y", "true", "1")
+    if output_queue is None:
+        return {}
+    await output_queue.put({
+        "status": "requires_input_bulk",
+        "question": "Please provide the following details.",
+        "fields": fields,
+    })
+    logger.info(f"Asking user for {len(fields)} fields in one message")
+
+    try:
+        answer = await asyncio.wait_for(input_queue.get(), timeout=USER_INPUT_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.error("User input timed out for bulk field request")
+        raise TimeoutError(f"No user response within {USER_INPUT_TIMEOUT}s for bulk field request")
+
+    if isinstance(answer, str):
+        try:
+            answer = json.loads(answer)
+        except ValueError:
+            answer = None
+    if not isinstance(answer, dict):
+        logger.warning("Bulk answer was not a JSON object — falling back to per-field questions")
+        return {}
+    logger.info(f"User answered {len(answer)} fields")
+    return answer
 
 
-def _get_profile_value(profile: dict, *keys) -> str:
+def _first_option(options: list[str]) -> str:
+    """Default for a select whose answer is left blank: its first option."""
+    return options[0] if options else ""
+
+
+def _norm_key(key: str) -> str:
+    """Normalise a profile key so 'aadhaarNumber' and 'aadhaar_number' collide."""
+    return key.lower().replace("_", "").replace("-", "")
+
+
+def _index_profile(profile: dict) -> dict[str, str]:
+    """Build a normalised-key index of the non-empty profile values."""
+    return {_norm_key(k): str(v) for k, v in profile.items() if v}
+
+
+def _get_profile_value(profile_idx: dict[str, str], *keys) -> str:
     """
-    Look up a value from the profile dict, trying multiple key names.
+    Look up a value in a normalised profile index, trying each key name.
     Returns the first non-empty match, or empty string.
     """
     for key in keys:
-        val = profile.get(key, "")
+        val = profile_idx.get(_norm_key(key))
         if val:
-            return str(val)
+            return val
     return ""
 
 
+# Option lists seen for cascading selects, keyed by (select index, *choices
+# made above it). Lets a later run offer the options for a question even if
+# the live dropdown is slow to load.
+_GEO_CASCADE_CACHE: dict[tuple[str | int, ...], list[str]] = {}
+
+
+# Selects populated at page load: State plus relationship, caste, gender,
+# farmer type and farmer category
+_STATIC_SELECTS = [0, 6, 10, 11, 12, 13]
+
+
+# Fields that can be collected up front: (profile key, question, select index
+# for option hints or None, default). Cascade-dependent dropdowns (district,
+# bank branch, ...) carry no options since theirs only load later.
+_PREFETCH_FIELDS: list[tuple[str, str, int | None, str]] = [
+    ("state", "Your State", 0, ""),
+    # Left blank, Step 1 falls back to the first listed scheme
+    ("scheme", "Scheme (e.g., PMFBY)", None, ""),
+    ("season", "Season (Kharif/Rabi/Zaid)", None, ""),
+    ("crop_year", "Year", None, "2025"),
+    ("full_name", "Full Name of Farmer", None, ""),
+    ("passbook_name", "Passbook Name (as in bank passbook)", None, ""),
+    ("relationship", "Relationship (S/O / D/O / W/O / C/O)", 6, "S/O"),
+    ("relative_name", "Father / Husband Name", None, ""),
+    ("mobile", "Mobile Number (10 digits)", None, ""),
+    ("age", "Age", None, ""),
+    ("caste", "Caste Category", 10, "GENERAL"),
+    ("gender", "Gender", 11, ""),
+    ("farmer_type", "Farmer Type (Small/Marginal/Others)", 12, "Small"),
+    ("farmer_category", "Farmer Category (Owner/Tenant/Share Cropper)", 13, "Owner"),
+    ("district", "District", None, ""),
+    ("sub_district", "Sub-District / Tehsil", None, ""),
+    ("village", "Village / Town", None, ""),
+    ("address", "Full Address", None, ""),
+    ("pincode", "PIN Code", None, ""),
+    ("aadhaar", "Aadhaar Number (12 digits)", None, ""),
+    ("bank_state", "Bank State", 0, ""),
+    ("bank_district", "Bank District", None, ""),
+    ("bank_name", "Bank Name", None, ""),
+    ("bank_branch", "Bank Branch", None, ""),
+    ("account_no", "Bank Account Number", None, ""),
+]
+
+# Other profile keys the form accepts for a prefetch field
+_PREFETCH_ALIASES: dict[str, tuple[str, ...]] = {
+    "crop_year": ("year",),
+    "full_name": ("name",),
+    "caste": ("category",),
+    "sub_district": ("taluka",),
+    "aadhaar": ("aadhaar_number",),
+}
+
+
 # ── Main Task Handler ───────────────────────────────────────────────────────
 
 class FarmerRegistrationTask:
@@ -158,48 +365,103 @@ class FarmerRegistrationTask:
     def __init__(self, browser: Browser, verbose: bool = False):
         self.browser = browser
         self.verbose = verbose
+        # Option texts per select index; refreshed after each AJAX cascade
+        self._select_cache: dict[int, list[str]] = {}
 
-    async def fill_form(self, executor=None, profile: dict = None, **pre_params) -> dict:
-        """
-        Navigate to farmer registration form via:
-          Homepage → Farmer Corner card → Guest Farmer button → /farmerRegistrationForm
-
-        Then fill fields using nth() index selectors (no id/name attributes on form).
+    def _cached_options(self, select_idx: int) -> list[str]:
+        """Option texts of the Nth select from the last snapshot."""
+        return self._select_cache.get(select_idx, [])
 
-        Args:
-            executor: The Executor instance (provides user_input_queue and agent_output_queue)
-            profile: Dict of farmer profile data to auto-fill from
-            **pre_params: Additional pre-filled parameters
+    async def _smart_select(self, page: Page, select_idx: int, value: str,
+                            description: str, wait_ms: int = 0) -> bool:
         """
-        # Set up I/O queues — either from executor or create standalone (for testing)
-        if executor:
-            output_q = executor.agent_output_queue
-            input_q = executor.user_input_queue
-        else:
-            output_q = asyncio.Queue()
-            input_q = asyncio.Queue()
-
-        if profile is None:
-            profile = {}
-
-        # Merge pre_params into profile (pre_params take precedence)
-        merged = {**profile, **pre_params}
+        Pick an option without the vision model whenever the option text can
+        be resolved (see _select_nth_by_label); vision_select is only reached
+        if that misses.
+        """
+        if await _select_nth_by_label(page, select_idx, value, wait_ms):
+            return True
+        return await self.browser.vision_select(select_idx, value, description, settle=0)
 
-        logger.section("Farmer Registration — Crop Insurance Application")
+    async def _fill_cascade(self, page: Page, first_idx: int, stages: list[tuple],
+                            ask, timeout_ms: int = 12000) -> list[str]:
+        """
+        Walk a chain of cascading selects (State → District → ..., Scheme →
+        Season → Year) starting at select[first_idx]. Each stage is
+        (question, profile_keys, default, description); default may be a
+        callable taking the loaded options (e.g. _first_option). After each pick the
+        wait for the next select runs in the background while the next answer
+        is resolved; if the user has to be asked, the options come from
+        _GEO_CASCADE_CACHE when seen before, else from that wait. The next
+        pick then waits for them and selects. Returns the chosen labels.
+        """
+        chosen: list[str] = []
+        wait_task: asyncio.Task | None = None
+        try:
+            for offset, (question, keys, default, description) in enumerate(stages):
+                idx = first_idx + offset
+                path = (idx, *chosen)
+                options = _GEO_CASCADE_CACHE.get(path) or self._cached_options(idx) or wait_task
+                value = await ask(question, *keys, options=options or None, default=default)
+                chosen.append(value)
+                if value:
+                    # Waits for the options to land, then picks with select_option
+                    await self._smart_select(
+                        page, idx, value, description,
+                        wait_ms=timeout_ms if wait_task is not None else 0,
+                    )
+                if wait_task is not None:
+                    options = await wait_task
+                    wait_task = None
+                    if options:
+                        _GEO_CASCADE_CACHE[path] = options
+                if not value:
+                    continue
+                if offset + 1 < len(stages):
+                    wait_task = asyncio.create_task(
+                        _wait_for_options(page, idx + 1, timeout_ms=timeout_ms)
+                    )
+        finally:
+            if wait_task is not None:
+                wait_task.cancel()
+        return chosen
+
+    async def _open_registration_form(self, page: Page) -> None:
+        """Homepage → Farmer Corner card → Guest Farmer → /farmerRegistrationForm."""
         logger.info("Navigating: Homepage → Farmer Corner → Guest Farmer")
+        # The SPA renders the service cards after DOMContentLoaded; they are
+        # the readiness signal, not the full load of every image
+        await self.browser.navigate("https://pmfby.gov.in/", ready_selector=SEL_SERVICE_CARD)
 
-        page = self.browser.page
+        # Fast path: both clicks in one evaluate
+        try:
+            clicked = await page.evaluate(_OPEN_GUEST_FARMER_JS, 6000)
+        except Exception:
+            clicked = "ERROR"
+        if clicked == "OK":
+            logger.success("Clicked 'Farmer Corner' → 'Guest Farmer'")
+        else:
+            logger.debug(f"In-page navigation clicks returned {clicked} — using locators", self.verbose)
+            await self._click_through_farmer_corner(page)
 
-        # ── Navigate via Homepage Cards ──────────────────────────────────
-        await self.browser.navigate("https://pmfby.gov.in/")
-        await asyncio.sleep(3)
+        # wait_for_url also sees the SPA's pushState route change (which
+        # expect_navigation would not); the form is usable once its first
+        # select renders, so neither step waits for the load event
+        try:
+            await page.wait_for_url(
+                "**/farmerRegistrationForm*", wait_until="domcontentloaded", timeout=15000
+            )
+            await page.locator("select").first.wait_for(state="visible", timeout=10000)
+        except Exception:
+            logger.warning("Registration form not reached — continuing anyway")
 
+    async def _click_through_farmer_corner(self, page: Page) -> None:
+        """Locator / vision fallback for the Farmer Corner → Guest Farmer clicks."""
         # Click "Farmer Corner" (index 0 in service card row)
         try:
-            farmer_corner = page.locator('[class*="ciListBtn"]').nth(0)
+            farmer_corner = page.locator(SEL_SERVICE_CARD).nth(0)
             await farmer_corner.wait_for(state="visible", timeout=8000)
             await farmer_corner.click()
-            await asyncio.sleep(2)
             logger.success("Clicked 'Farmer Corner' card")
         except Exception as e:
             logger.warning(f"Could not click Farmer Corner card: {e}")
@@ -211,7 +473,6 @@ class FarmerRegistrationTask:
         # Click "Guest Farmer" button in the resulting modal/dropdown
         try:
             await page.click("text=Guest Farmer", timeout=6000)
-            await asyncio.sleep(3)
             logger.success("Clicked 'Guest Farmer'")
         except Exception:
             await self.browser.vision_click(
@@ -219,19 +480,75 @@ class FarmerRegistrationTask:
                 "the 'Guest Farmer' button inside the Farmer Corner popup or modal"
             )
 
-        await asyncio.sleep(3)
+    async def fill_form(self, executor=None, profile: dict = None, **pre_params) -> dict:
+        """
+        Navigate to farmer registration form (unless the page is already on it) via:
+          Homepage → Farmer Corner card → Guest Farmer button → /farmerRegistrationForm
+
+        Then fill fields using nth() index selectors (no id/name attributes on form).
+
+        Args:
+            executor: The Executor instance (provides user_input_queue and agent_output_queue)
+            profile: Dict of farmer profile data to auto-fill from
+            **pre_params: Additional pre-filled parameters
+        """
+        # Set up I/O queues from the executor; standalone runs ask on the CLI
+        if executor:
+            output_q = executor.agent_output_queue
+            input_q = executor.user_input_queue
+        else:
+            output_q = input_q = None
+
+        if profile is None:
+            profile = {}
+
+        # Merge pre_params into profile (pre_params take precedence) and index
+        # by normalised key so variant casings resolve with one lookup
+        merged_idx = _index_profile({**profile, **pre_params})
+
+        logger.section("Farmer Registration — Crop Insurance Application")
+
+        page = self.browser.page
+
+        # ── Navigate via Homepage Cards ──────────────────────────────────
+        # If already on the form, the readiness probe doubles as the initial
+        # snapshot of the selects populated at load
+        snap = None
+        if "farmerRegistrationForm" in page.url:
+            snap = await _page_snapshot(page, _STATIC_SELECTS, {"first_select": "select"})
+        if snap and snap["selectCount"] >= 4 and snap["visible"].get("first_select"):
+            logger.info("Already on the registration form — skipping navigation")
+        else:
+            await self._open_registration_form(page)
+            snap = None
         logger.info(f"Current URL: {page.url}")
 
         logger.info("Fill mode: Using nth() index selectors — per live exploration, "
                     "form has NO id/name attributes.\n")
 
+        # Normalised keys the user already answered (possibly blank) in the
+        # bulk prefetch — those are not asked again
+        bulk_answered: set[str] = set()
+
         # ── Helper: get value from profile or ask user ───────────────────
-        async def _get_or_ask(question: str, *profile_keys, options: list = None, default: str = "") -> str:
-            """Check profile for value, ask user if missing."""
-            value = _get_profile_value(merged, *profile_keys)
+        async def _get_or_ask(question: str, *profile_keys, options: list = None,
+                              default: str | Callable[[list[str]], str] = "") -> str:
+            """
+            Check profile for value, ask user if missing. options may be a
+            pending task (a cascade's option wait); it is only awaited if the
+            user actually has to be asked or a callable default needs it.
+            """
+            value = _get_profile_value(merged_idx, *profile_keys)
             if value:
                 logger.info(f"  Auto-filling from profile: {question} = {value[:30]}")
                 return value
+            answered = any(_norm_key(k) in bulk_answered for k in profile_keys)
+            if isinstance(options, asyncio.Task) and (callable(default) or not answered):
+                options = await options
+            if callable(default):
+                default = default(options or [])
+            if answered:
+                return default
             if default:
                 # Ask with default hint
                 full_q = f"{question} (default: {default})"
@@ -240,65 +557,68 @@ class FarmerRegistrationTask:
             answer = await _ask_user(output_q, input_q, full_q, options=options)
             return answer or default
 
+        # Text inputs are queued here and written in one batch at each barrier
+        # (before OTP verification and before the CAPTCHA/submit step)
+        pending_fills: list[tuple[int, str]] = []
+
+        # ── Prefetch: ask for every missing field in one message ─────────
+        # One snapshot of the selects populated at load (State + the static
+        # Step 2 dropdowns); cascade targets are filled in by their waits
+        if snap is None:
+            snap = await _page_snapshot(page, _STATIC_SELECTS)
+        self._select_cache.update(snap["selects"])
+        missing = [
+            {
+                "key": key,
+                "question": question,
+                "options": self._cached_options(select_idx) if select_idx is not None else [],
+                "default": default,
+            }
+            for key, question, select_idx, default in _PREFETCH_FIELDS
+            if not _get_profile_value(merged_idx, key, *_PREFETCH_ALIASES.get(key, ()))
+        ]
+        if missing:
+            answers = await _ask_user_bulk(output_q, input_q, missing)
+            offered = {_norm_key(f["key"]) for f in missing}
+            for key, val in answers.items():
+                nk = _norm_key(str(key))
+                if nk not in offered:
+                    continue
+                bulk_answered.add(nk)
+                if val:
+                    merged_idx[nk] = str(val).strip()
+
         # ── Step 1: Scheme & Season Selection ─────────────────────────────
         logger.section("Step 1: Scheme, Season & Year")
 
-        # State (index 0)
-        state_opts = await _list_nth_select_options(page, 0)
-        if state_opts:
-            logger.info(f"States available ({len(state_opts)}): {', '.join(state_opts[:5])}...")
-        state = await _get_or_ask("Your State", "state", options=state_opts[:20] if state_opts else None)
-        if state:
-            await self.browser.vision_select(0, state, "State dropdown (first select on page)")
-            await _wait_for_options(page, 1)  # Wait for Scheme to load
-
-        # Scheme (index 1)
-        scheme_opts = await _list_nth_select_options(page, 1)
-        if scheme_opts:
-            logger.info(f"Schemes: {', '.join(scheme_opts)}")
-        scheme = await _get_or_ask(
-            "Scheme (e.g., PMFBY)", "scheme",
-            options=scheme_opts if scheme_opts else None,
-            default=scheme_opts[0] if scheme_opts else ""
-        )
-        if scheme:
-            await self.browser.vision_select(1, scheme, "Scheme dropdown (second select)")
-            await _wait_for_options(page, 2)
-
-        # Season (index 2)
-        season_opts = await _list_nth_select_options(page, 2)
-        if season_opts:
-            logger.info(f"Seasons: {', '.join(season_opts)}")
-        season = await _get_or_ask("Season (Kharif/Rabi/Zaid)", "season", options=season_opts if season_opts else None)
-        if season:
-            await self.browser.vision_select(2, season, "Season dropdown (Kharif / Rabi / Zaid)")
-            await asyncio.sleep(2)
-
-        # Year (index 3)
-        year_opts = await _list_nth_select_options(page, 3)
-        if year_opts:
-            logger.info(f"Years: {', '.join(year_opts[:5])}")
-        year = await _get_or_ask("Year", "crop_year", "year", options=year_opts[:5] if year_opts else None, default="2025")
-        if year:
-            await self.browser.vision_select(3, year, "Year dropdown")
-            await asyncio.sleep(2)
+        # State (0) → Scheme (1) → Season (2) → Year (3)
+        state, scheme, season, year = await self._fill_cascade(page, 0, [
+            ("Your State", ("state",), "", "State dropdown (first select on page)"),
+            ("Scheme (e.g., PMFBY)", ("scheme",), _first_option, "Scheme dropdown (second select)"),
+            ("Season (Kharif/Rabi/Zaid)", ("season",), "", "Season dropdown (Kharif / Rabi / Zaid)"),
+            ("Year", ("crop_year", "year"), "2025", "Year dropdown"),
+        ], _get_or_ask)
 
         # ── Step 2: Farmer Details ────────────────────────────────────────
         logger.section("Step 2: Farmer Details")
 
+        # The Step 2 dropdowns do not cascade, so they are collected here and
+        # set concurrently once every answer is known
+        static_selects: list[tuple[int, str, str]] = []
+
         full_name = await _get_or_ask("Full Name of Farmer", "full_name", "name")
         if full_name:
-            await _fill_nth_input(page, 4, full_name)
+            pending_fills.append((4, full_name))
 
         passbook_name = await _get_or_ask("Passbook Name (as in bank passbook)", "passbook_name")
         if not passbook_name and full_name:
             passbook_name = full_name  # Sensible default
             logger.info(f"  Using full name as passbook name: {passbook_name}")
         if passbook_name:
-            await _fill_nth_input(page, 5, passbook_name)
+            pending_fills.append((5, passbook_name))
 
         # Relationship (index 6): S/O, D/O, W/O, C/O
-        rel_opts = await _list_nth_select_options(page, 6)
+        rel_opts = self._cached_options(6)
         if rel_opts:
             logger.info(f"Relationship: {', '.join(rel_opts)}")
         relationship = await _get_or_ask(
@@ -306,22 +626,22 @@ class FarmerRegistrationTask:
             options=rel_opts if rel_opts else None, default="S/O"
         )
         if relationship:
-            await _select_nth_by_label(page, 6, relationship)
+            static_selects.append((6, relationship, "Relationship dropdown (S/O / D/O / W/O / C/O)"))
 
         relative_name = await _get_or_ask("Father / Husband Name", "relative_name")
         if relative_name:
-            await _fill_nth_input(page, 7, relative_name)
+            pending_fills.append((7, relative_name))
 
         mobile = await _get_or_ask("Mobile Number (10 digits)", "mobile")
         if mobile:
-            await _fill_nth_input(page, 8, mobile)
+            pending_fills.append((8, mobile))
 
         age = await _get_or_ask("Age", "age")
         if age:
-            await _fill_nth_input(page, 9, age)
+            pending_fills.append((9, age))
 
         # Caste (index 10): GENERAL, OBC, SC, ST
-        caste_opts = await _list_nth_select_options(page, 10)
+        caste_opts = self._cached_options(10)
         if caste_opts:
             logger.info(f"Caste options: {', '.join(caste_opts)}")
         caste = await _get_or_ask(
@@ -329,10 +649,10 @@ class FarmerRegistrationTask:
             options=caste_opts if caste_opts else None, default="GENERAL"
         )
         if caste:
-            await self.browser.vision_select(10, caste, "Caste Category dropdown (GENERAL/OBC/SC/ST)")
+            static_selects.append((10, caste, "Caste Category dropdown (GENERAL/OBC/SC/ST)"))
 
         # Gender (index 11)
-        gender_opts = await _list_nth_select_options(page, 11)
+        gender_opts = self._cached_options(11)
         if gender_opts:
             logger.info(f"Gender options: {', '.join(gender_opts)}")
         gender = await _get_or_ask(
@@ -340,10 +660,10 @@ class FarmerRegistrationTask:
             options=gender_opts if gender_opts else None
         )
         if gender:
-            await self.browser.vision_select(11, gender, "Gender dropdown (Male/Female/Others)")
+            static_selects.append((11, gender, "Gender dropdown (Male/Female/Others)"))
 
         # Farmer Type (index 12)
-        ftype_opts = await _list_nth_select_options(page, 12)
+        ftype_opts = self._cached_options(12)
         if ftype_opts:
             logger.info(f"Farmer Types: {', '.join(ftype_opts)}")
         farmer_type = await _get_or_ask(
@@ -351,10 +671,10 @@ class FarmerRegistrationTask:
             options=ftype_opts if ftype_opts else None, default="Small"
         )
         if farmer_type:
-            await self.browser.vision_select(12, farmer_type, "Farmer Type dropdown")
+            static_selects.append((12, farmer_type, "Farmer Type dropdown"))
 
         # Farmer Category (index 13)
-        fcat_opts = await _list_nth_select_options(page, 13)
+        fcat_opts = self._cached_options(13)
         if fcat_opts:
             logger.info(f"Farmer Categories: {', '.join(fcat_opts)}")
         farmer_cat = await _get_or_ask(
@@ -362,14 +682,25 @@ class FarmerRegistrationTask:
             options=fcat_opts if fcat_opts else None, default="Owner"
         )
         if farmer_cat:
-            await self.browser.vision_select(13, farmer_cat, "Farmer Category dropdown (Owner/Tenant/Share Cropper)")
+            static_selects.append((13, farmer_cat, "Farmer Category dropdown (Owner/Tenant/Share Cropper)"))
+
+        # DOM picks run concurrently; any vision fallbacks then run one at a
+        # time, as they screenshot and click on the shared page
+        dom_picks = [_select_nth_by_label(page, idx, label) for idx, label, _ in static_selects]
+        picked = await asyncio.gather(*dom_picks)
+        for (idx, label, desc), ok in zip(static_selects, picked):
+            if not ok:
+                await self.browser.vision_select(idx, label, desc, settle=0)
+
+        await _fill_inputs_bulk(page, pending_fills)
+        pending_fills.clear()
 
         # ── Step 3: Mobile OTP ────────────────────────────────────────────
         logger.section("Step 3: Mobile Verification (OTP)")
         try:
-            verify_btn = page.locator("button:has-text('Verify')")
-            if await verify_btn.count() > 0:
-                await verify_btn.first.click()
+            verify_btn = await _find_button(page, VERIFY_BUTTON_LABELS)
+            if verify_btn is not None:
+                await verify_btn.click()
                 logger.warning("OTP sent to your mobile number.")
                 otp = await _ask_user(
                     output_q, input_q,
@@ -378,10 +709,9 @@ class FarmerRegistrationTask:
                 if otp:
                     # Try to find and fill the OTP input field
                     try:
-                        otp_input = page.locator("input[placeholder*='OTP'], input[placeholder*='otp']")
+                        otp_input = page.locator(SEL_OTP_INPUT).first
                         if await otp_input.count() > 0:
-                            await otp_input.first.fill(otp)
-                            await asyncio.sleep(2)
+                            await otp_input.fill(otp)
                     except Exception:
                         logger.warning("Could not auto-fill OTP, user may need to enter manually")
         except Exception as e:
@@ -394,74 +724,56 @@ class FarmerRegistrationTask:
         # ── Step 4: Residential Details ───────────────────────────────────
         logger.section("Step 4: Residential Details")
 
-        res_state = await _get_or_ask("Residential State", "state", default=state or "")
-        if res_state:
-            await self.browser.vision_select(14, res_state, "Residential State dropdown")
-            await _wait_for_options(page, 15)  # Wait for District
-
-        res_district = await _get_or_ask("District", "district")
-        if res_district:
-            await self.browser.vision_select(15, res_district, "Residential District dropdown")
-            await _wait_for_options(page, 16)  # Wait for Sub-District
-
-        res_sub = await _get_or_ask("Sub-District / Tehsil", "taluka", "sub_district")
-        if res_sub:
-            await self.browser.vision_select(16, res_sub, "Sub-District or Tehsil dropdown")
-            await _wait_for_options(page, 17)  # Wait for Village
-
-        res_village = await _get_or_ask("Village / Town", "village")
-        if res_village:
-            await self.browser.vision_select(17, res_village, "Village or Town dropdown")
+        # State (14) → District (15) → Sub-District (16) → Village (17)
+        res_state, res_district, res_sub, res_village = await self._fill_cascade(page, 14, [
+            ("Residential State", ("state",), state or "", "Residential State dropdown"),
+            ("District", ("district",), "", "Residential District dropdown"),
+            ("Sub-District / Tehsil", ("taluka", "sub_district"), "", "Sub-District or Tehsil dropdown"),
+            ("Village / Town", ("village",), "", "Village or Town dropdown"),
+        ], _get_or_ask)
 
         address = await _get_or_ask("Full Address", "address")
         if address:
-            await _fill_nth_input(page, 18, address)
+            pending_fills.append((18, address))
 
         pincode = await _get_or_ask("PIN Code", "pincode")
         if pincode:
-            await _fill_nth_input(page, 19, pincode)
+            pending_fills.append((19, pincode))
 
         # ── Step 5: Farmer ID ─────────────────────────────────────────────
         logger.section("Step 5: Farmer ID (Aadhaar)")
 
         # ID Type (index 20) — usually pre-set to UID/Aadhaar
-        id_num = await _get_or_ask("Aadhaar Number (12 digits)", "aadhaar", "aadhaarNumber")
+        id_num = await _get_or_ask("Aadhaar Number (12 digits)", "aadhaar", "aadhaar_number")
         if id_num:
-            await _fill_nth_input(page, 21, id_num)
+            pending_fills.append((21, id_num))
 
         # ── Step 6: Bank Account Details ──────────────────────────────────
         logger.section("Step 6: Bank Account Details")
 
-        bank_state = await _get_or_ask("Bank State", "bank_state", default=state or "")
-        if bank_state:
-            await self.browser.vision_select(25, bank_state, "Bank State dropdown")
-            await _wait_for_options(page, 26, timeout_ms=10000)
-
-        bank_district = await _get_or_ask("Bank District", "bank_district")
-        if bank_district:
-            await self.browser.vision_select(26, bank_district, "Bank District dropdown")
-            await _wait_for_options(page, 27, timeout_ms=10000)
-
-        bank_name = await _get_or_ask("Bank Name", "bank_name")
-        if bank_name:
-            await self.browser.vision_select(27, bank_name, "Bank Name dropdown")
-            await _wait_for_options(page, 28, timeout_ms=10000)
-
-        branch = await _get_or_ask("Bank Branch", "bank_branch")
-        if branch:
-            await self.browser.vision_select(28, branch, "Bank Branch dropdown")
+        # Bank State (25) → District (26) → Bank Name (27) → Branch (28)
+        bank_state, bank_district, bank_name, branch = await self._fill_cascade(page, 25, [
+            ("Bank State", ("bank_state",), state or "", "Bank State dropdown"),
+            ("Bank District", ("bank_district",), "", "Bank District dropdown"),
+            ("Bank Name", ("bank_name",), "", "Bank Name dropdown"),
+            ("Bank Branch", ("bank_branch",), "", "Bank Branch dropdown"),
+        ], _get_or_ask, timeout_ms=10000)
 
         acc_no = await _get_or_ask("Bank Account Number", "account_no")
         if acc_no:
-            await _fill_nth_input(page, 29, acc_no)
+            pending_fills.append((29, acc_no))
             # Auto-fill confirm field with same value
-            await _fill_nth_input(page, 30, acc_no)
+            pending_fills.append((30, acc_no))
+
+        await _fill_inputs_bulk(page, pending_fills)
+        pending_fills.clear()
 
         # ── Step 7: CAPTCHA ───────────────────────────────────────────────
         logger.section("Step 7: CAPTCHA")
         try:
-            cap_visible = await page.is_visible("input[placeholder*='Captcha'], input[placeholder*='captcha']")
-            if cap_visible:
+            captcha_input = page.locator(SEL_CAPTCHA_INPUT).first
+            snap = await _page_snapshot(page, [], {"captcha": SEL_CAPTCHA_INPUT})
+            if snap["visible"].get("captcha"):
                 await self.browser.screenshot("captcha_farmer_reg")
                 captcha = await _ask_user(
                     output_q, input_q,
@@ -469,9 +781,7 @@ class FarmerRegistrationTask:
                 )
                 if captcha:
                     try:
-                        captcha_input = page.locator("input[placeholder*='Captcha'], input[placeholder*='captcha']")
-                        if await captcha_input.count() > 0:
-                            await captcha_input.first.fill(captcha)
+                        await captcha_input.fill(captcha)
                     except Exception:
                         logger.warning("Could not auto-fill CAPTCHA")
         except Exception:
@@ -482,24 +792,30 @@ class FarmerRegistrationTask:
         await self.browser.screenshot("form_filled_preview")
         logger.info("Screenshot saved — review the completed form.")
 
-        # Yield ready_to_submit with a summary so the user can confirm
+        # Yield ready_to_submit with the summary and the Yes/No question in one
+        # message; the single reply is the confirmation
         summary = {
             "name": full_name, "mobile": mobile, "age": age,
             "state": state, "district": res_district,
             "season": season, "year": year,
         }
-        await output_q.put({
-            "status": "ready_to_submit",
-            "summary": {k: v for k, v in summary.items() if v}
-        })
-
-        confirm_answer = await _ask_user(output_q, input_q, "Submit the form? (Yes/No)", options=["Yes", "No"])
+        preview = ""
+        confirm_answer = await _ask_user(
+            output_q, input_q, "Submit the form? (Yes/No)", options=["Yes", "No"],
+            status="ready_to_submit", summary={k: v for k, v in summary.items() if v},
+        )
         if confirm_answer.lower() in ("yes", "y", "true", "1"):
             try:
-                submit = page.locator("button:has-text('Create User'), button[type='submit']").first
+                submit = await _find_button(page, SUBMIT_BUTTON_LABELS, submit_fallback=True)
+                if submit is None:
+                    raise RuntimeError("no 'Create User' or submit button on the page")
                 await submit.click()
-                await asyncio.sleep(5)
-                await self.browser.screenshot("submission_result")
+                await self.browser.wait_for_network_idle()
+                # Independent CDP calls — capture the result page text and image together
+                preview, _ = await asyncio.gather(
+                    self.browser.get_text_preview(400),
+                    self.browser.screenshot("submission_result"),
+                )
                 logger.success("Form submitted. Check browser for confirmation.")
             except Exception as e:
                 logger.error(f"Submit failed: {e}")
@@ -510,9 +826,10 @@ class FarmerRegistrationTask:
         else:
             logger.info("Submission cancelled by user.")
 
-        body = await self.browser.get_text("body")
+        if not preview:
+            preview = await self.browser.get_text_preview(400)
         return {
             "task": "farmer_registration",
             "status": "completed",
-            "preview": body[:400] if body else "",
+            "preview": preview,
         }
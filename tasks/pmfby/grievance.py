@@ -11,16 +11,36 @@ KEY FINDINGS:
 - The "Complaint Status" option is also available under Farmer Corner if user only wants to check.
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 import asyncio
 from playwright.async_api import Page
 
 from shared.browser.controller import Browser
 from shared.utils import logger
-from shared.utils.helpers import prompt_user, prompt_confirm
+from shared.utils.helpers import prompt_user_async, prompt_confirm_async
+
+# ── KRPH selectors (shared by both grievance flows) ────────────────────────
+
+SEL_FARMER_CORNER = "button:has-text('Farmer Corner'), a:has-text('Farmer Corner')"
+# Fallbacks for the Farmer Corner entries; the exact text match is tried first
+SEL_CROP_LOSS_ITEM = "[class*='dropdown'] a:has-text('Crop Loss'), li:has-text('Crop Loss') a"
+SEL_COMPLAINT_STATUS_ITEM = (
+    "[class*='dropdown'] a:has-text('Complaint'), li:has-text('Complaint Status') a"
+)
+SEL_MOBILE_INPUT = "input#mobile-number"
+SEL_CAPTCHA_INPUT = "input[placeholder='Enter Captcha Code']"
+SEL_SEND_OTP = ".get-otpN"
+SEL_POLICY_INPUT = "input[placeholder*='Policy'], input[placeholder*='Application']"
+SEL_SEARCH_BUTTON = "button:has-text('Search'), button:has-text('Fetch')"
+SEL_LOSS_DATE_INPUT = "input[type='date'], input[placeholder*='Date'], input[placeholder*='date']"
+SEL_SUBMIT_BUTTON = "button:has-text('Submit'), button[type='submit']"
+OPTIONAL_FIELD_TIMEOUT = 800  # ms — crop loss form fields vary by policy/location
+COMPLAINT_RESULT_SELECTORS = [
+    "table",
+    "[class*='complaint']",
+    "[class*='status']",
+    "main",
+    "body",
+]
 
 
 class GrievanceTask:
@@ -31,89 +51,126 @@ class GrievanceTask:
     def __init__(self, browser: Browser, verbose: bool = False):
         self.browser = browser
         self.verbose = verbose
+        # Mobile number whose KRPH OTP sign-in already completed in this session
+        self._krph_authed_mobile: str | None = None
+
+    def _is_krph_authed(self, mobile: str) -> bool:
+        """True if the KRPH SPA is already signed in for this mobile number."""
+        return (
+            bool(mobile)
+            and self._krph_authed_mobile == mobile
+            and self.browser.page.url.startswith(self.KRPH_URL)
+        )
 
-    async def file_grievance(self, **pre_params) -> dict:
+    async def _record_krph_sign_in(self, mobile: str) -> None:
         """
-        Navigate to KRPH portal → Farmer Corner → Crop Loss Intimation.
-        Sign in with mobile + OTP, then guide through the crop loss form.
+        Remember `mobile` as signed in once the KRPH sign-in form is gone.
+        The OTP handoff and handle_otp_flow return whether or not the OTP
+        was completed, so a sign-in form still on screen clears the record.
         """
-        logger.section("Grievance / Crop Loss Intimation — KRPH Portal")
-        logger.info(f"Navigating to KRPH portal: {self.KRPH_URL}\n")
+        try:
+            await self.browser.page.locator(SEL_MOBILE_INPUT).first.wait_for(
+                state="hidden", timeout=5000
+            )
+        except Exception:
+            logger.warning("KRPH sign-in form is still showing — OTP sign-in not confirmed")
+            self._krph_authed_mobile = None
+            return
+        self._krph_authed_mobile = mobile or None
 
-        page = self.browser.page
+    async def _open_farmer_corner_item(self, item_text: str, item_selector: str) -> None:
+        """
+        Open KRPH → Farmer Corner → `item_text`.
+        Skips the SPA reload when the page is already on KRPH, and falls back
+        to a user handoff if either menu click fails.
+        """
+        browser = self.browser
+        page = browser.page
 
-        # ── Step 1: Navigate to KRPH ─────────────────────────────────────
-        await self.browser.navigate(self.KRPH_URL)
-        await asyncio.sleep(5)  # KRPH is a separate server, needs extra time
+        if page.url.startswith(self.KRPH_URL):
+            logger.debug("Already on KRPH — skipping navigation", self.verbose)
+        else:
+            await browser.navigate(self.KRPH_URL)
+            await browser.wait_for_network_idle()  # KRPH is a separate server
         logger.info(f"Current URL: {page.url}")
 
-        # ── Step 2: Open Farmer Corner dropdown ───────────────────────────
         logger.step("Opening 'Farmer Corner' menu in KRPH...")
         try:
             # The Farmer Corner button on KRPH is a MUI button — use text search
-            farmer_corner = page.locator("button:has-text('Farmer Corner'), a:has-text('Farmer Corner')")
-            await farmer_corner.first.wait_for(state="visible", timeout=10000)
-            await farmer_corner.first.click()
-            await asyncio.sleep(2)
+            farmer_corner = page.locator(SEL_FARMER_CORNER).first
+            await farmer_corner.wait_for(state="visible", timeout=10000)
+            await farmer_corner.click()
             logger.success("Farmer Corner menu opened")
         except Exception as e:
             logger.error(f"Could not open Farmer Corner menu: {e}")
-            await self.browser.handoff_to_user(
+            await browser.handoff_to_user(
                 "Please click 'Farmer Corner' in the top menu of the KRPH portal, "
                 "then type 'continue'."
             )
 
-        # ── Step 3: Click "Crop Loss Intimation" ──────────────────────────
-        logger.step("Clicking 'Crop Loss Intimation'...")
+        logger.step(f"Clicking '{item_text}'...")
         try:
-            crop_loss_link = page.locator(
-                "text=Crop Loss Intimation, "
-                "[class*='dropdown'] a:has-text('Crop Loss'), "
-                "li:has-text('Crop Loss') a"
-            )
-            await crop_loss_link.first.wait_for(state="visible", timeout=6000)
-            await crop_loss_link.first.click()
-            await asyncio.sleep(3)
-            logger.success("Crop Loss Intimation selected")
+            item = page.get_by_text(item_text, exact=True).or_(page.locator(item_selector)).first
+            await item.wait_for(state="visible", timeout=6000)
+            await item.click()
+            await page.wait_for_load_state("domcontentloaded")
+            logger.success(f"{item_text} selected")
         except Exception as e:
-            logger.warning(f"Crop Loss Intimation click error: {e}")
-            await self.browser.handoff_to_user(
-                "Please click 'Crop Loss Intimation' in the Farmer Corner dropdown, "
+            logger.warning(f"{item_text} click error: {e}")
+            await browser.handoff_to_user(
+                f"Please click '{item_text}' in the Farmer Corner dropdown, "
                 "then type 'continue'."
             )
 
+    async def file_grievance(self, **pre_params) -> dict:
+        """
+        Navigate to KRPH portal → Farmer Corner → Crop Loss Intimation.
+        Sign in with mobile + OTP, then guide through the crop loss form.
+        """
+        logger.section("Grievance / Crop Loss Intimation — KRPH Portal")
+        logger.info(f"Navigating to KRPH portal: {self.KRPH_URL}\n")
+
+        browser = self.browser
+        page = browser.page
+
+        # ── Steps 1-3: KRPH → Farmer Corner → Crop Loss Intimation ────────
+        await self._open_farmer_corner_item("Crop Loss Intimation", SEL_CROP_LOSS_ITEM)
+
         # ── Step 4: Mobile Number Sign-in ────────────────────────────────
         logger.section("Step 4: Mobile Sign-In (OTP Required)")
         logger.info("A mobile number + OTP is required to proceed with crop loss intimation.\n")
 
-        mobile = pre_params.get("mobile") or prompt_user(
+        mobile = pre_params.get("mobile") or await prompt_user_async(
             "Your registered mobile number (10 digits)"
         )
-        if mobile:
-            try:
-                mobile_input = page.locator("input#mobile-number")
-                await mobile_input.wait_for(state="visible", timeout=8000)
-                await mobile_input.fill("")
-                await mobile_input.type(mobile, delay=60)
-                logger.success(f"Entered mobile number: {mobile}")
-            except Exception as e:
-                logger.warning(f"Mobile input error: {e}")
-                await self.browser.handoff_to_user(
-                    f"Please enter your mobile number ({mobile}) in the input field, "
-                    "then type 'continue'."
-                )
-
-        # ── CAPTCHA for OTP send ──────────────────────────────────────────
-        logger.warning("CAPTCHA is required before sending OTP — handing off to user.")
-        await self.browser.screenshot("krph_captcha")
-        await self.browser.handoff_to_user(
-            "Please:\n"
-            "  1. Solve the CAPTCHA shown in the KRPH browser window\n"
-            "  2. Enter the CAPTCHA code in the field\n"
-            "  3. Click 'Send OTP'\n"
-            "  4. Enter the OTP received on your mobile\n"
-            "  5. Type 'continue' here when done."
-        )
+        if self._is_krph_authed(mobile):
+            logger.success(f"KRPH session already signed in for {mobile} — skipping OTP")
+        else:
+            if mobile:
+                try:
+                    mobile_input = page.locator(SEL_MOBILE_INPUT)
+                    await mobile_input.wait_for(state="visible", timeout=8000)
+                    await mobile_input.fill(mobile)
+                    logger.success(f"Entered mobile number: {mobile}")
+                except Exception as e:
+                    logger.warning(f"Mobile input error: {e}")
+                    await browser.handoff_to_user(
+                        f"Please enter your mobile number ({mobile}) in the input field, "
+                        "then type 'continue'."
+                    )
+
+            # ── CAPTCHA for OTP send ──────────────────────────────────────
+            logger.warning("CAPTCHA is required before sending OTP — handing off to user.")
+            browser.screenshot_later("krph_captcha")
+            await browser.handoff_to_user(
+                "Please:\n"
+                "  1. Solve the CAPTCHA shown in the KRPH browser window\n"
+                "  2. Enter the CAPTCHA code in the field\n"
+                "  3. Click 'Send OTP'\n"
+                "  4. Enter the OTP received on your mobile\n"
+                "  5. Type 'continue' here when done."
+            )
+            await self._record_krph_sign_in(mobile)
 
         # ── Step 5: After OTP — crop loss form appears ────────────────────
         logger.section("Step 5: Crop Loss Form")
@@ -122,28 +179,28 @@ class GrievanceTask:
 
         # Try to fill form fields if they're present (structure varies by state/scheme)
         # Policy number search
+        # Optional fields: a short visibility wait doubles as the presence check
         try:
-            policy_input = page.locator("input[placeholder*='Policy'], input[placeholder*='Application']").first
-            if await policy_input.is_visible():
-                policy = pre_params.get("policy_id") or prompt_user("Policy / Application Number")
-                if policy:
-                    await policy_input.fill(policy)
-                    search_btn = page.locator("button:has-text('Search'), button:has-text('Fetch')")
-                    if await search_btn.count() > 0:
-                        await search_btn.first.click()
-                        await asyncio.sleep(4)
+            policy_input = page.locator(SEL_POLICY_INPUT).first
+            await policy_input.wait_for(state="visible", timeout=OPTIONAL_FIELD_TIMEOUT)
+            policy = pre_params.get("policy_id") or await prompt_user_async("Policy / Application Number")
+            if policy:
+                await policy_input.fill(policy)
+                try:
+                    await page.locator(SEL_SEARCH_BUTTON).first.click(timeout=OPTIONAL_FIELD_TIMEOUT)
+                    await asyncio.sleep(4)
+                except Exception:
+                    pass
         except Exception:
             pass
 
         # Loss details
         try:
-            loss_date_input = page.locator(
-                "input[type='date'], input[placeholder*='Date'], input[placeholder*='date']"
-            ).first
-            if await loss_date_input.is_visible():
-                loss_date = prompt_user("Date of Crop Loss (YYYY-MM-DD)")
-                if loss_date:
-                    await loss_date_input.fill(loss_date)
+            loss_date_input = page.locator(SEL_LOSS_DATE_INPUT).first
+            await loss_date_input.wait_for(state="visible", timeout=OPTIONAL_FIELD_TIMEOUT)
+            loss_date = await prompt_user_async("Date of Crop Loss (YYYY-MM-DD)")
+            if loss_date:
+                await loss_date_input.fill(loss_date)
         except Exception:
             pass
 
@@ -152,29 +209,30 @@ class GrievanceTask:
             "The crop loss form has dynamic fields that vary by policy/location. "
             "You may need to complete some fields manually."
         )
-        screenshots = await self.browser.screenshot("crop_loss_form")
+        await browser.screenshot("crop_loss_form")
 
-        if prompt_confirm("Do you want the agent to submit the form?", default=False):
+        if await prompt_confirm_async("Do you want the agent to submit the form?", default=False):
             try:
-                submit_btn = page.locator("button:has-text('Submit'), button[type='submit']").last
+                submit_btn = page.locator(SEL_SUBMIT_BUTTON).last
                 await submit_btn.click()
                 await asyncio.sleep(5)
-                await self.browser.screenshot("crop_loss_submitted")
+                browser.screenshot_later("crop_loss_submitted")
                 logger.success("Crop loss form submitted!")
             except Exception as e:
                 logger.error(f"Submit failed: {e}")
-                await self.browser.handoff_to_user(
+                await browser.handoff_to_user(
                     "Please submit the form manually, then type 'continue'."
                 )
         else:
             logger.info("Submission cancelled by user.")
 
-        body = await self.browser.get_text("body")
+        body = await browser.get_text_preview(400)
+        await browser.flush_screenshots()
         return {
             "task": "grievance",
             "mobile": mobile or "",
             "status": "completed",
-            "result_preview": body[:400] if body else "See screenshots",
+            "result_preview": body or "See screenshots",
         }
 
     async def check_complaint_status(self, **pre_params) -> dict:
@@ -188,69 +246,31 @@ class GrievanceTask:
         logger.section("KRPH — Complaint Status Check")
         logger.info(f"Navigating to KRPH portal: {self.KRPH_URL}\n")
 
-        page = self.browser.page
-        await self.browser.navigate(self.KRPH_URL)
-        await asyncio.sleep(5)
-
-        # Open Farmer Corner dropdown
-        logger.step("Opening 'Farmer Corner' menu in KRPH...")
-        try:
-            farmer_corner = page.locator(
-                "button:has-text('Farmer Corner'), a:has-text('Farmer Corner')"
-            )
-            await farmer_corner.first.wait_for(state="visible", timeout=10000)
-            await farmer_corner.first.click()
-            await asyncio.sleep(2)
-            logger.success("Farmer Corner menu opened")
-        except Exception as e:
-            logger.error(f"Could not open Farmer Corner menu: {e}")
-            await self.browser.handoff_to_user(
-                "Please click 'Farmer Corner' in the KRPH navigation menu, "
-                "then type 'continue'."
-            )
+        browser = self.browser
+        page = browser.page
 
-        # Click "Complaint Status"
-        logger.step("Clicking 'Complaint Status'...")
-        try:
-            complaint_link = page.locator(
-                "text=Complaint Status, "
-                "[class*='dropdown'] a:has-text('Complaint'), "
-                "li:has-text('Complaint Status') a"
-            )
-            await complaint_link.first.wait_for(state="visible", timeout=6000)
-            await complaint_link.first.click()
-            await asyncio.sleep(3)
-            logger.success("Complaint Status selected")
-        except Exception as e:
-            logger.warning(f"Complaint Status click error: {e}")
-            await self.browser.handoff_to_user(
-                "Please click 'Complaint Status' in the Farmer Corner dropdown, "
-                "then type 'continue'."
-            )
+        await self._open_farmer_corner_item("Complaint Status", SEL_COMPLAINT_STATUS_ITEM)
 
         # Mobile OTP authentication (same flow as crop loss intimation)
         logger.section("Mobile OTP Authentication")
-        mobile = pre_params.get("mobile") or prompt_user(
+        mobile = pre_params.get("mobile") or await prompt_user_async(
             "Your registered mobile number (10 digits)"
         )
-        if mobile:
-            await self.browser.handle_otp_flow(
-                mobile=mobile,
-                mobile_selector="input#mobile-number",
-                captcha_input_selector="input[placeholder='Enter Captcha Code']",
-                otp_btn_selector=".get-otpN",
+        if self._is_krph_authed(mobile):
+            logger.success(f"KRPH session already signed in for {mobile} — skipping OTP")
+        elif mobile:
+            await browser.handle_otp_flow(
+                mobile,
+                input_selector=SEL_MOBILE_INPUT,
+                captcha_selector=SEL_CAPTCHA_INPUT,
+                otp_btn_selector=SEL_SEND_OTP,
             )
+            await self._record_krph_sign_in(mobile)
 
         # Extract complaint status list
         await asyncio.sleep(3)
         result_text = ""
-        for sel in [
-            "table",
-            "[class*='complaint']",
-            "[class*='status']",
-            "main",
-            "body",
-        ]:
+        for sel in COMPLAINT_RESULT_SELECTORS:
             try:
                 txt = await page.inner_text(sel)
                 if txt and len(txt.strip()) > 30:
@@ -261,13 +281,13 @@ class GrievanceTask:
 
         if result_text:
             logger.section("Complaint Status Results")
-            for line in result_text.split("\n")[:25]:
-                if line.strip():
-                    logger.info(f"  {line.strip()}")
+            lines = [f"  {line.strip()}" for line in result_text.split("\n")[:25] if line.strip()]
+            logger.info("\n".join(lines))
         else:
             logger.warning("Could not auto-extract complaints — check the browser window.")
 
-        await self.browser.screenshot("complaint_status_result")
+        browser.screenshot_later("complaint_status_result")
+        await browser.flush_screenshots()
 
         return {
             "task": "grievance",
@@ -10,18 +10,43 @@ KEY FINDINGS:
 - Post-login: 16+ courses available, certificates downloadable
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 import asyncio
 
 from shared.browser.controller import Browser
 from shared.utils import logger
-from shared.utils.helpers import prompt_user, prompt_confirm
+from shared.utils.helpers import prompt_user_async, prompt_confirm_async
 
 LMS_URL = "https://pmfby.gov.in/lms/"
 
+# ── LMS selectors ───────────────────────────────────────────────────────────
+
+SEL_REGISTER_LINK = "a.nav-link:has-text('Register'), a:has-text('Register')"
+SEL_LOGIN_LINK = ".hightligh-link.nav-link, a.nav-link:has-text('Login')"
+SEL_CONFIRM_PASSWORD = "input[name='confirmPassword'], input[placeholder*='Confirm']"
+SEL_STATE_SELECT = "select[name='state'], select[id*='state']"
+SEL_DISTRICT_SELECT = "select[name='district'], select[id*='district']"
+SEL_REGISTER_SUBMIT = "button[type='submit']:has-text('Register'), button:has-text('Sign Up')"
+SEL_LOGIN_MOBILE = "input[name='mobile'], input[placeholder*='Mobile']"
+SEL_LOGIN_PASSWORD = "input[name='password'], input[type='password']"
+SEL_CAPTCHA_INPUT = "input[placeholder*='aptcha'], input[placeholder*='captcha']"
+SEL_LOGIN_SUBMIT = "button[type='submit']:has-text('Login'), button:has-text('Sign In')"
+SEL_COURSES_LINK = "a:has-text('Courses'), a:has-text('My Courses'), a[href*='course']"
+SEL_COURSE_TITLES = ".course-title, .card-title, h3, h4, [class*='course'] [class*='title']"
+MAX_COURSES = 20
+
+# Collects trimmed, de-duplicated titles longer than 5 chars, stopping at `limit`
+_COURSE_TITLES_JS = """
+([sel, limit]) => {
+    const out = new Set();
+    for (const el of document.querySelectorAll(sel)) {
+        const t = (el.innerText || '').trim();
+        if (t.length > 5) out.add(t);
+        if (out.size >= limit) break;
+    }
+    return [...out];
+}
+"""
+
 
 class LMSAccessTask:
     """Handles LMS registration, login, and course browsing."""
@@ -40,33 +65,34 @@ class LMSAccessTask:
         No OTP — password-based only.
         """
         logger.section("LMS — New User Registration")
-        page = self.browser.page
+        browser = self.browser
+        page = browser.page
 
-        await self.browser.navigate(LMS_URL)
+        await browser.navigate(LMS_URL)
         await asyncio.sleep(3)
 
         # Click "Register" in the top nav
         try:
-            reg_btn = page.locator("a.nav-link:has-text('Register'), a:has-text('Register')")
+            reg_btn = page.locator(SEL_REGISTER_LINK)
             await reg_btn.first.wait_for(state="visible", timeout=8000)
             await reg_btn.first.click()
             await asyncio.sleep(3)
             logger.success("Opened Registration form")
         except Exception as e:
             logger.error(f"Could not open registration form: {e}")
-            await self.browser.handoff_to_user(
+            await browser.handoff_to_user(
                 "Please click 'Register' in the top navigation of the LMS portal, "
                 "then type 'continue'."
             )
 
         # Collect registration details
-        first_name = pre_params.get("first_name") or prompt_user("First Name")
-        last_name  = pre_params.get("last_name")  or prompt_user("Last Name")
-        email      = pre_params.get("email")       or prompt_user("Email (optional, press Enter to skip)")
-        mobile     = pre_params.get("lms_mobile") or pre_params.get("mobile") or prompt_user("Mobile Number")
-        password   = pre_params.get("lms_password") or prompt_user("Password (min 8 chars)")
-        state      = pre_params.get("state")       or prompt_user("State")
-        district   = pre_params.get("district")    or prompt_user("District")
+        first_name = pre_params.get("first_name") or await prompt_user_async("First Name")
+        last_name  = pre_params.get("last_name")  or await prompt_user_async("Last Name")
+        email      = pre_params.get("email")       or await prompt_user_async("Email (optional, press Enter to skip)")
+        mobile     = pre_params.get("lms_mobile") or pre_params.get("mobile") or await prompt_user_async("Mobile Number")
+        password   = pre_params.get("lms_password") or await prompt_user_async("Password (min 8 chars)")
+        state      = pre_params.get("state")       or await prompt_user_async("State")
+        district   = pre_params.get("district")    or await prompt_user_async("District")
 
         # Fill fields (using text/placeholder selectors — LMS has proper HTML structure)
         fields = [
@@ -81,7 +107,7 @@ class LMSAccessTask:
             if not value:
                 continue
             try:
-                await self.browser.vision_fill(
+                await browser.vision_fill(
                     selector.split(",")[0].strip(), value,
                     f"the {label} input field in the LMS registration form"
                 )
@@ -90,8 +116,8 @@ class LMSAccessTask:
 
         # Confirm Password
         try:
-            await self.browser.vision_fill(
-                "input[name='confirmPassword'], input[placeholder*='Confirm']",
+            await browser.vision_fill(
+                SEL_CONFIRM_PASSWORD,
                 password,
                 "the Confirm Password field"
             )
@@ -101,14 +127,12 @@ class LMSAccessTask:
         # State dropdown
         if state:
             try:
-                await self.browser.vision_click(
-                    "select[name='state'], select[id*='state']",
+                await browser.vision_click(
+                    SEL_STATE_SELECT,
                     "the State dropdown in the LMS registration form"
                 )
                 await asyncio.sleep(1)
-                await self.browser.select_option(
-                    "select[name='state'], select[id*='state']", label=state
-                )
+                await browser.select_option(SEL_STATE_SELECT, label=state)
                 await asyncio.sleep(2)
             except Exception as e:
                 logger.warning(f"State selection failed: {e}")
@@ -117,37 +141,36 @@ class LMSAccessTask:
         if district:
             try:
                 await asyncio.sleep(2)
-                await self.browser.select_option(
-                    "select[name='district'], select[id*='district']", label=district
-                )
+                await browser.select_option(SEL_DISTRICT_SELECT, label=district)
             except Exception as e:
                 logger.warning(f"District selection failed: {e}")
 
-        await self.browser.screenshot("lms_registration_filled")
+        await browser.screenshot("lms_registration_filled")
         logger.info("Screenshot saved — review details before submitting.")
 
-        if prompt_confirm("Submit LMS registration?", default=False):
+        if await prompt_confirm_async("Submit LMS registration?", default=False):
             try:
-                submit = page.locator("button[type='submit']:has-text('Register'), button:has-text('Sign Up')")
+                submit = page.locator(SEL_REGISTER_SUBMIT)
                 await submit.first.click()
                 await asyncio.sleep(5)
-                await self.browser.screenshot("lms_registration_result")
+                browser.screenshot_later("lms_registration_result")
                 logger.success("LMS registration form submitted!")
             except Exception as e:
                 logger.error(f"Submit failed: {e}")
-                await self.browser.handoff_to_user(
+                await browser.handoff_to_user(
                     "Please submit the registration form manually, then type 'continue'."
                 )
         else:
             logger.info("Registration cancelled.")
 
-        body = await self.browser.get_text("body")
+        body = await browser.get_text_preview(400)
+        await browser.flush_screenshots()
         return {
             "task": "lms_access",
             "action": "register",
             "mobile": mobile or "",
             "status": "completed",
-            "result_preview": body[:400] if body else "See screenshot",
+            "result_preview": body or "See screenshot",
         }
 
     # ── Login ─────────────────────────────────────────────────────────────────
@@ -159,21 +182,22 @@ class LMSAccessTask:
         CAPTCHA: image-based — requires user handoff.
         """
         logger.section("LMS — Farmer Login")
-        page = self.browser.page
+        browser = self.browser
+        page = browser.page
 
-        await self.browser.navigate(LMS_URL)
+        await browser.navigate(LMS_URL)
         await asyncio.sleep(3)
 
         # Click "Login" in nav
         try:
-            login_btn = page.locator(".hightligh-link.nav-link, a.nav-link:has-text('Login')")
+            login_btn = page.locator(SEL_LOGIN_LINK)
             await login_btn.first.wait_for(state="visible", timeout=8000)
             await login_btn.first.click()
             await asyncio.sleep(3)
             logger.success("Opened LMS Login form")
         except Exception as e:
             logger.error(f"Could not open Login form: {e}")
-            await self.browser.handoff_to_user(
+            await browser.handoff_to_user(
                 "Please click 'Login' in the LMS portal navigation, then type 'continue'."
             )
 
@@ -181,57 +205,58 @@ class LMSAccessTask:
         mobile = (
             pre_params.get("lms_mobile")
             or pre_params.get("mobile")
-            or prompt_user("LMS Registered Mobile Number")
+            or await prompt_user_async("LMS Registered Mobile Number")
         )
         if mobile:
-            await self.browser.vision_fill(
-                "input[name='mobile'], input[placeholder*='Mobile']",
+            await browser.vision_fill(
+                SEL_LOGIN_MOBILE,
                 mobile,
                 "Mobile Number input in LMS login form"
             )
 
         # Password
-        password = pre_params.get("lms_password") or prompt_user("LMS Password")
+        password = pre_params.get("lms_password") or await prompt_user_async("LMS Password")
         if password:
-            await self.browser.vision_fill(
-                "input[name='password'], input[type='password']",
+            await browser.vision_fill(
+                SEL_LOGIN_PASSWORD,
                 password,
                 "Password input in LMS login form"
             )
 
         # CAPTCHA — image-based, always requires handoff
-        captcha_present = await self.browser.detect_captcha()
+        captcha_present = await browser.detect_captcha()
         if captcha_present:
-            await self.browser.handle_captcha()
+            await browser.handle_captcha()
         else:
             # Fill captcha field manually if image was not auto-detected
-            captcha_val = prompt_user("Enter the CAPTCHA code shown in the browser")
+            captcha_val = await prompt_user_async("Enter the CAPTCHA code shown in the browser")
             if captcha_val:
-                await self.browser.vision_fill(
-                    "input[placeholder*='aptcha'], input[placeholder*='captcha']",
+                await browser.vision_fill(
+                    SEL_CAPTCHA_INPUT,
                     captcha_val,
                     "the CAPTCHA input field"
                 )
 
         # Submit login
         try:
-            submit = page.locator("button[type='submit']:has-text('Login'), button:has-text('Sign In')")
+            submit = page.locator(SEL_LOGIN_SUBMIT)
             await submit.first.click()
             await asyncio.sleep(5)
             logger.success("LMS login submitted")
         except Exception as e:
             logger.error(f"Login submit failed: {e}")
-            await self.browser.handoff_to_user("Please click the Login button manually, then type 'continue'.")
+            await browser.handoff_to_user("Please click the Login button manually, then type 'continue'.")
 
-        await self.browser.screenshot("lms_login_result")
+        browser.screenshot_later("lms_login_result")
 
-        body = await self.browser.get_text("body")
+        body = await browser.get_text_preview(400)
+        await browser.flush_screenshots()
         return {
             "task": "lms_access",
             "action": "login",
             "mobile": mobile or "",
             "status": "completed",
-            "result_preview": body[:400] if body else "See lms_login_result.png",
+            "result_preview": body or "See lms_login_result.png",
         }
 
     # ── Browse Courses ────────────────────────────────────────────────────────
@@ -242,13 +267,12 @@ class LMSAccessTask:
         Pre-condition: user must already be logged in.
         """
         logger.section("LMS — Available Courses")
-        page = self.browser.page
+        browser = self.browser
+        page = browser.page
 
         # Try to navigate to courses section
         try:
-            courses_link = page.locator(
-                "a:has-text('Courses'), a:has-text('My Courses'), a[href*='course']"
-            )
+            courses_link = page.locator(SEL_COURSES_LINK)
             if await courses_link.count() > 0:
                 await courses_link.first.click()
                 await asyncio.sleep(3)
@@ -256,23 +280,27 @@ class LMSAccessTask:
             pass
 
         # Extract course titles
-        course_titles = await self.browser.get_all_text(
-            ".course-title, .card-title, h3, h4, [class*='course'] [class*='title']"
-        )
-        course_titles = [t.strip() for t in course_titles if t.strip() and len(t.strip()) > 5]
+        try:
+            course_titles = await page.evaluate(
+                _COURSE_TITLES_JS, [SEL_COURSE_TITLES, MAX_COURSES]
+            )
+        except Exception:
+            course_titles = []
 
         if course_titles:
             logger.section("Available Courses")
-            for i, title in enumerate(course_titles[:20], 1):
-                logger.info(f"  {i}. {title}")
+            logger.info("\n".join(
+                f"  {i}. {title}" for i, title in enumerate(course_titles, 1)
+            ))
         else:
             logger.warning("Could not auto-extract course list — check the browser window.")
 
-        await self.browser.screenshot("lms_courses")
+        browser.screenshot_later("lms_courses")
+        await browser.flush_screenshots()
 
         return {
             "task": "lms_access",
             "action": "browse_courses",
             "status": "completed",
-            "courses": course_titles[:20],
+            "courses": course_titles,
         }
@@ -5,7 +5,7 @@ Behaviour fixes (v3):
   - Auto-selects from prompt params without prompting user
   - Aborts immediately on required-field selection failure (no silent continuation)
   - Shows available options and aborts when crop not found in list
-  - Uses smart_match: exact → partial → acronym → metaphone
+  - Uses smart_match (shared.utils.matching): exact → acronym → phonetic → fuzzy
 
 KEY FACTS from live exploration:
   - Calculator is a MODAL on the homepage.
@@ -16,18 +16,15 @@ KEY FACTS from live exploration:
   - "PMFBY" is the abbreviation for "Pradhan Mantri Fasal Bima Yojana"
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from itertools import islice
 
-import asyncio
-import re
-
-from playwright.async_api import Page
+from playwright.async_api import Locator, Page
 
 from shared.browser.controller import Browser
+from shared.browser.page_helpers import call_page_helper
 from shared.utils import logger
-from shared.utils.helpers import prompt_user, display_table
+from shared.utils.helpers import prompt_user_async, display_table
+from shared.utils.matching import smart_match
 
 
 # ── Custom exception for hard stops ────────────────────────────────────────
@@ -36,64 +33,49 @@ class TaskAbortError(Exception):
     """Raised when the task cannot proceed and must stop cleanly."""
 
 
-# ── Smart fuzzy matching ────────────────────────────────────────────────────
+# ── Hardcoded Selectors for Calculation fields ──────────────────────────────
 
-def _acronym_of(abbr: str, phrase: str) -> bool:
-    """
-    Return True if 'abbr' is an acronym (initial letters) of 'phrase'.
-    E.g. "PMFBY" matches "Pradhan Mantri Fasal Bima Yojana"
-    """
-    words = re.findall(r"[A-Za-z]+", phrase)
-    initials = "".join(w[0].upper() for w in words if w)
-    return abbr.upper() == initials
+# The modal body; its six cascade selects are addressed by index inside it
+# through the page helpers' cached live collection
+SEL_MODAL = "[class*='InnerCalculator']"
+SEASON, YEAR, SCHEME, STATE, DISTRICT, CROP = range(6)
+# Anchored on the modal's own (hash-suffix-free) class names rather than the
+# full path from #app, so the browser matches a short chain
+SEL_AREA = f"{SEL_MODAL} form > div > div > div:nth-child(7) > div > input"
+SEL_SERVICE_CARD = '[class*="ciListBtn"]'
+SEL_RESULT = ".modal-body table, .modal-body .result, [class*='premiumResult']"
+SEL_CALCULATE = "[class*='cardFooter'].modal-footer > div > button:nth-child(2)"
+SEL_CALCULATE_ANY = f"{SEL_CALCULATE}, button:has-text('Calculate')"
+
+# Result containers, most specific first; the modal body is the last resort
+RESULT_SELECTORS = [
+    ".modal-body table",
+    "[class*='InnerCalculator'] table",
+    ".modal-body .result",
+    "[class*='premiumResult']",
+    ".modal-body",
+]
+
+# First result container with more than 20 characters of text, probed in one
+# evaluate instead of an inner_text() call (and its wait) per selector
+_RESULT_TEXT_JS = """
+(selectors) => {
+    for (const sel of selectors) {
+        const el = document.querySelector(sel);
+        const text = el ? el.innerText.trim() : '';
+        if (text.length > 20) return text;
+    }
+    return '';
+}
+"""
 
 
-def _smart_match(label: str, options: list[str]) -> str | None:
+def _param_text(value) -> str:
     """
-    Find the best match for 'label' in 'options' using a priority chain:
-      1. Exact match (case-insensitive)
-      2. Partial / substring match
-      3. Acronym match (e.g. "PMFBY" → "Pradhan Mantri Fasal Bima Yojana")
-      4. Token overlap (any word in label appears in option)
-
-    Returns the matched option string, or None if no match.
+    A request param as stripped text ('' when unset). Intent params come
+    from LLM JSON, so year and area often arrive as numbers.
     """
-    lw = label.strip().lower()
-
-    # 1. Exact
-    for opt in options:
-        if opt.strip().lower() == lw:
-            return opt
-
-    # 2. Partial (label is substring of option, or option is substring of label)
-    for opt in options:
-        if lw in opt.strip().lower() or opt.strip().lower() in lw:
-            return opt
-
-    # 3. Acronym
-    for opt in options:
-        if _acronym_of(label.strip(), opt.strip()):
-            return opt
-
-    # 4. Token overlap — any meaningful word (>3 chars) from label appears in option
-    words = [w for w in re.findall(r"[a-z]+", lw) if len(w) > 3]
-    for opt in options:
-        opt_lower = opt.strip().lower()
-        if any(w in opt_lower for w in words):
-            return opt
-
-    return None
-
-# ── Hardcoded Selectors for Calculation fields ──────────────────────────────
-
-SEL_SEASON = "#app > div > div:nth-child(1) > div > div.newHeader__headerMain___3js6e > div.newHeader__cardsMenu___1Sgs1.container-fluid > div > div:nth-child(1) > div > div.newHeader__modalInnerOverlay___2U5R2 > div > div > div > div > div.newHeader__InnerCalculator___1YK6V.modal-body > form > div > div > div:nth-child(1) > div > select"
-SEL_YEAR = "#app > div > div:nth-child(1) > div > div.newHeader__headerMain___3js6e > div.newHeader__cardsMenu___1Sgs1.container-fluid > div > div:nth-child(1) > div > div.newHeader__modalInnerOverlay___2U5R2 > div > div > div > div > div.newHeader__InnerCalculator___1YK6V.modal-body > form > div > div > div:nth-child(2) > div > select"
-SEL_SCHEME = "#app > div > div:nth-child(1) > div > div.newHeader__headerMain___3js6e > div.newHeader__cardsMenu___1Sgs1.container-fluid > div > div:nth-child(1) > div > div.newHeader__modalInnerOverlay___2U5R2 > div > div > div > div > div.newHeader__InnerCalculator___1YK6V.modal-body > form > div > div > div:nth-child(3) > div > select"
-SEL_STATE = "#app > div > div:nth-child(1) > div > div.newHeader__headerMain___3js6e > div.newHeader__cardsMenu___1Sgs1.container-fluid > div > div:nth-child(1) > div > div.newHeader__modalInnerOverlay___2U5R2 > div > div > div > div > div.newHeader__InnerCalculator___1YK6V.modal-body > form > div > div > div:nth-child(4) > div > select"
-SEL_DISTRICT = "#app > div > div:nth-child(1) > div > div.newHeader__headerMain___3js6e > div.newHeader__cardsMenu___1Sgs1.container-fluid > div > div:nth-child(1) > div > div.newHeader__modalInnerOverlay___2U5R2 > div > div > div > div > div.newHeader__InnerCalculator___1YK6V.modal-body > form > div > div > div:nth-child(5) > div > select"
-SEL_CROP = "xpath=//*[@id=\"app\"]/div/div[1]/div/div[2]/div[3]/div/div[1]/div/div[3]/div/div/div/div/div[2]/form/div/div/div[6]/div/select"
-SEL_AREA = "#app > div > div:nth-child(1) > div > div.newHeader__headerMain___3js6e > div.newHeader__cardsMenu___1Sgs1.container-fluid > div > div:nth-child(1) > div > div.newHeader__modalInnerOverlay___2U5R2 > div > div > div > div > div.newHeader__InnerCalculator___1YK6V.modal-body > form > div > div > div:nth-child(7) > div > input"
-SEL_CALCULATE = "#app > div > div:nth-child(1) > div > div.newHeader__headerMain___3js6e > div.newHeader__cardsMenu___1Sgs1.container-fluid > div > div:nth-child(1) > div > div.newHeader__modalInnerOverlay___2U5R2 > div > div > div > div > div.newHeader__cardFooter___1P8JE.modal-footer > div > button:nth-child(2)"
+    return "" if value is None else str(value).strip()
 
 
 # ── Main Task Handler ───────────────────────────────────────────────────────
@@ -104,13 +86,16 @@ class PremiumCalculatorTask:
     def __init__(self, browser: Browser, verbose: bool = False):
         self.browser = browser
         self.verbose = verbose
+        # All cascade selects in the modal; built once per page, since
+        # locators are lazy and re-resolve on each action
+        self._modal_selects: Locator | None = None
 
     async def _ask_sahayak(self, executor, question: str, options: list = None) -> str:
         """Uses executor queues to ask frontend Sahayak and get user response."""
         if not executor:
             if options:
                 logger.info(f"Available options: {options}")
-            return prompt_user(question)
+            return await prompt_user_async(question)
         
         await executor.agent_output_queue.put({
             "status": "requires_input",
@@ -120,66 +105,108 @@ class PremiumCalculatorTask:
         answer = await executor._await_user_input()
         return answer
 
-    async def _get_options_for_selector(self, page: Page, selector: str) -> list[str]:
-        """Return text options for a specific select element."""
+    def _modal_select(self, page: Page, idx: int) -> Locator:
+        """Locator for the nth cascade select inside the calculator modal."""
+        if self._modal_selects is None or self._modal_selects.page is not page:
+            self._modal_selects = page.locator(SEL_MODAL).locator("select")
+        return self._modal_selects.nth(idx)
+
+    async def _get_modal_options(self, page: Page, idx: int) -> list[str]:
+        """Return text options for the nth select in the modal."""
         try:
-            options = await page.locator(selector).locator("option").evaluate_all(
-                "opts => opts.map(o => o.textContent.trim()).filter(t => t && t.toLowerCase() !== 'select' && t !== '--Select--')"
-            )
-            return options
+            return (await call_page_helper(page, "snapshotSelects", [idx], SEL_MODAL))[0]
         except Exception:
             return []
 
-    async def _wait_selector_populated(self, page: Page, selector: str, min_count: int = 2) -> bool:
-        """Wait for specific select to have at least min_count options."""
+    async def _wait_modal_populated(self, page: Page, idx: int, min_count: int = 2,
+                                    timeout_ms: int = 15000) -> list[str]:
+        """
+        Wait for the nth select in the modal to have at least min_count
+        options and return their texts ([] on timeout). One evaluate: returns
+        at once if already populated, else waits on a MutationObserver.
+        """
         try:
-            for _ in range(30):
-                count = await page.locator(selector).locator("option").count()
-                if count >= min_count:
-                    return True
-                await asyncio.sleep(0.5)
-            return False
+            opts = await call_page_helper(page, "waitForOptions", idx, min_count, timeout_ms, SEL_MODAL)
         except Exception:
-            return False
+            opts = None
+        return opts or []
 
-    async def _select_by_selector_label(self, page: Page, selector: str, label: str) -> str | None:
+    async def _select_modal_by_label(self, page: Page, idx: int, label: str,
+                                     opts: list[str] | None = None) -> tuple[str | None, list[str]]:
         """
-        Select option in specific select using smart_match.
-        Returns the matched option text, or None if no match found.
+        Select option in the nth modal select using smart_match.
+        Pass opts if the options were already read (e.g. to ask the user) to
+        skip re-reading them; an empty list is re-read, as the select may have
+        populated since. Returns (matched option text or None, options).
         """
-        opts = await self._get_options_for_selector(page, selector)
         if not opts:
-            return None
-            
-        matched = _smart_match(label, opts)
-        if not matched:
-            return None
+            opts = await self._get_modal_options(page, idx)
+        if not opts:
+            return None, opts
 
+        matched = smart_match(label, opts)
+        if not matched or not await self._select_matched(page, idx, matched):
+            return None, opts
+        return matched, opts
+
+    async def _select_matched(self, page: Page, idx: int, option: str) -> bool:
+        """Set the nth modal select to an option text already picked by smart_match."""
+        select = self._modal_select(page, idx)
         try:
             # Playwright select_option automatically dispatches 'change' and handles matching
-            await page.locator(selector).select_option(label=matched)
-            await asyncio.sleep(2)
-            return matched
+            await select.select_option(label=option)
+            return True
         except Exception:
             try:
                 # Fallback to value if label matching fails
-                await page.locator(selector).select_option(value=matched)
-                await asyncio.sleep(2)
-                return matched
+                await select.select_option(value=option)
+                return True
             except Exception:
-                return None
-            
-    async def _select_required(self, page: Page, selector: str, label: str, field_name: str) -> str:
-        matched = await self._select_by_selector_label(page, selector, label)
+                return False
+
+    async def _select_required(self, page: Page, idx: int, label: str, field_name: str,
+                               opts: list[str] | None = None) -> str:
+        matched, opts = await self._select_modal_by_label(page, idx, label, opts)
         if not matched:
-            opts = await self._get_options_for_selector(page, selector)
+            # Scraped lists can repeat an option; list each once, in page order
+            unique = dict.fromkeys(opts)
+            more = "..." if len(unique) > 10 else ""
             raise TaskAbortError(
                 f"Could not select '{label}' for field '{field_name}'.\n"
-                f"Available options ({len(opts)}): {', '.join(opts[:10])}..."
+                f"Available options ({len(unique)}): {', '.join(islice(unique, 10))}{more}"
             )
         logger.success(f"  Selected {field_name}: {matched}")
         return matched
 
+    async def _select_and_load_next(self, page: Page, idx: int, label: str, field_name: str,
+                                    opts: list[str], next_idx: int) -> tuple[str, list[str]]:
+        """
+        Select 'label' in the nth modal select and return (matched option,
+        options of select next_idx). With the options known, the pick and
+        the wait for the next cascade level run in one evaluate; otherwise
+        (or if that fails) select_option, wait and read separately.
+        Raises TaskAbortError if nothing matches.
+        """
+        matched = smart_match(label, opts) if opts else None
+        if matched:
+            try:
+                res = await call_page_helper(
+                    page, "selectAndWait", idx, matched.lower(), next_idx, 2, 15000, SEL_MODAL
+                )
+                if res["result"].startswith(("OK:", "SAME:")):
+                    logger.success(f"  Selected {field_name}: {matched}")
+                    return matched, res["next"] or await self._get_modal_options(page, next_idx)
+            except Exception as e:
+                logger.debug(f"  In-page select failed for {field_name}: {e}", self.verbose)
+            # Already matched — only the select itself is retried
+            if not await self._select_matched(page, idx, matched):
+                raise TaskAbortError(f"Could not select '{matched}' for field '{field_name}'.")
+            logger.success(f"  Selected {field_name}: {matched}")
+        else:
+            # Options unread or no match: re-read and match, or abort listing them
+            matched = await self._select_required(page, idx, label, field_name, opts)
+        return matched, await self._wait_modal_populated(page, next_idx)
+
     async def calculate(self, **pre_params) -> dict:
         """
         Open the Premium Calculator modal on the homepage and fill cascading dropdowns using interactive mode.
@@ -192,15 +219,13 @@ class PremiumCalculatorTask:
         page = self.browser.page
 
         # ── Navigate and open modal ──────────────────────────────────────
-        await self.browser.navigate("https://pmfby.gov.in/")
-        await asyncio.sleep(3)
+        await self.browser.navigate("https://pmfby.gov.in/", ready_selector=SEL_SERVICE_CARD)
 
         logger.step("Clicking 'Insurance Premium Calculator' service card (index 1)...")
         try:
-            card = page.locator('[class*="ciListBtn"]').nth(1)
+            card = page.locator(SEL_SERVICE_CARD).nth(1)
             await card.wait_for(state="visible", timeout=8000)
             await card.click()
-            await asyncio.sleep(3)
             logger.success("Premium Calculator modal opened")
         except Exception as e:
             return self._abort(f"Could not open calculator modal: {e}")
@@ -213,12 +238,13 @@ class PremiumCalculatorTask:
         except Exception:
             logger.warning("Modal selector timeout — proceeding anyway")
 
-        # Confirm first dropdown is ready
-        if not await self._wait_selector_populated(page, SEL_SEASON):
+        # Confirm first dropdown is ready; its options seed the cascade
+        season_opts = await self._wait_modal_populated(page, SEASON)
+        if not season_opts:
             return self._abort("Modal did not load its dropdowns in time.")
 
         try:
-            return await self._fill_and_calculate(page, pre_params)
+            return await self._fill_and_calculate(page, pre_params, season_opts)
         except TaskAbortError as e:
             logger.error(f"\n❌ Calculation aborted: {e}\n")
             await self.browser.screenshot("premium_calc_abort")
@@ -228,98 +254,89 @@ class PremiumCalculatorTask:
                 "reason": str(e),
             }
 
-    async def _fill_and_calculate(self, page: Page, params: dict) -> dict:
-        """Fill modal dropdowns, click Calculate, extract result."""
+    async def _fill_and_calculate(self, page: Page, params: dict, season_opts: list[str]) -> dict:
+        """
+        Fill modal dropdowns, click Calculate, extract result. season_opts
+        are the Season options read by the modal readiness wait.
+        """
         executor = params.get("executor")
         profile = params.get("profile", {})
         
-        # ── Season ────────────────────────────────────────────────────────
-        season_opts = await self._get_options_for_selector(page, SEL_SEASON)
-        season_raw = await self._ask_sahayak(executor, "Please pick a season for insurance premium calculation.", season_opts)
-        season = await self._select_required(page, SEL_SEASON, season_raw, "Season")
+        # Each pick also waits for the next cascade level and returns its
+        # options, so every step is one round-trip once the answer is known.
+        # Values given in the request are used without asking.
 
-        await self._wait_selector_populated(page, SEL_YEAR)
+        # ── Season ────────────────────────────────────────────────────────
+        season_raw = _param_text(params.get("season")) or await self._ask_sahayak(
+            executor, "Please pick a season for insurance premium calculation.", season_opts
+        )
+        season, year_opts = await self._select_and_load_next(
+            page, SEASON, season_raw, "Season", season_opts, YEAR
+        )
 
         # ── Year ──────────────────────────────────────────────────────────
-        year_opts = await self._get_options_for_selector(page, SEL_YEAR)
-        year_raw = await self._ask_sahayak(executor, "Please pick a year.", year_opts)
-        year = await self._select_required(page, SEL_YEAR, year_raw, "Year")
-
-        await self._wait_selector_populated(page, SEL_SCHEME)
+        year_raw = _param_text(params.get("year")) or await self._ask_sahayak(executor, "Please pick a year.", year_opts)
+        year, scheme_opts = await self._select_and_load_next(
+            page, YEAR, year_raw, "Year", year_opts, SCHEME
+        )
 
         # ── Scheme ────────────────────────────────────────────────────────
         # Always "Pradhan Mantri Fasal Bima Yojna" (or PMFBY)
         scheme_raw = "Pradhan Mantri Fasal Bima Yojna"
-        scheme = await self._select_by_selector_label(page, SEL_SCHEME, scheme_raw)
-        if not scheme: 
-            scheme = await self._select_required(page, SEL_SCHEME, "PMFBY", "Scheme")
-        else:
-            logger.success(f"  Selected Scheme: {scheme}")
-
-        await self._wait_selector_populated(page, SEL_STATE)
+        if not smart_match(scheme_raw, scheme_opts):
+            scheme_raw = "PMFBY"
+        scheme, state_opts = await self._select_and_load_next(
+            page, SCHEME, scheme_raw, "Scheme", scheme_opts, STATE
+        )
 
         # ── State ─────────────────────────────────────────────────────────
-        state_raw = profile.get("state")
-        if not state_raw:
-            state_raw = profile.get("address.state")
+        state_raw = _param_text(params.get("state") or profile.get("state") or profile.get("address.state"))
         if not state_raw:
-            state_opts = await self._get_options_for_selector(page, SEL_STATE)
             state_raw = await self._ask_sahayak(executor, "I could not find your state in the profile. Which state?", state_opts)
-            
-        state = await self._select_required(page, SEL_STATE, state_raw, "State")
-
-        await self._wait_selector_populated(page, SEL_DISTRICT)
+        state, district_opts = await self._select_and_load_next(
+            page, STATE, state_raw, "State", state_opts, DISTRICT
+        )
 
         # ── District ──────────────────────────────────────────────────────
-        district_raw = profile.get("district")
+        district_raw = _param_text(
+            params.get("district") or profile.get("district") or profile.get("address.district")
+        )
         if not district_raw:
-            district_raw = profile.get("address.district")
-        if not district_raw:
-            district_opts = await self._get_options_for_selector(page, SEL_DISTRICT)
             district_raw = await self._ask_sahayak(executor, "I could not find your district. Which district?", district_opts)
-            
-        district = await self._select_required(page, SEL_DISTRICT, district_raw, "District")
-
-        await self._wait_selector_populated(page, SEL_CROP)
+        district, crop_opts = await self._select_and_load_next(
+            page, DISTRICT, district_raw, "District", district_opts, CROP
+        )
 
         # ── Crop ──────────────────────────────────────────────────────────
-        crop_opts = await self._get_options_for_selector(page, SEL_CROP)
-        crop_raw = await self._ask_sahayak(executor, "Which crop are you insuring?", crop_opts)
-        crop = await self._select_required(page, SEL_CROP, crop_raw, "Crop")
+        crop_raw = _param_text(params.get("crop")) or await self._ask_sahayak(executor, "Which crop are you insuring?", crop_opts)
+        crop = await self._select_required(page, CROP, crop_raw, "Crop", crop_opts)
 
         # ── Area ──────────────────────────────────────────────────────────
-        area_raw = await self._ask_sahayak(executor, "Please enter the area of your land in hectares.")
+        area_raw = _param_text(params.get("area")) or await self._ask_sahayak(
+            executor, "Please enter the area of your land in hectares."
+        )
         await page.fill(SEL_AREA, area_raw)
         logger.success(f"  Filled Area: {area_raw}")
 
         # ── Click Calculate ───────────────────────────────────────────────
         logger.step("Clicking Calculate...")
         try:
-            calc_btn = page.locator(f"{SEL_CALCULATE}, button:has-text('Calculate')").last
+            calc_btn = page.locator(SEL_CALCULATE_ANY).last
             await calc_btn.wait_for(state="visible", timeout=5000)
             await calc_btn.click()
-            await asyncio.sleep(5)
             logger.success("Calculate clicked — waiting for result...")
         except Exception as e:
             raise TaskAbortError(f"Calculate button not found or not clickable: {e}")
 
         # ── Extract result ────────────────────────────────────────────────
-        await asyncio.sleep(2)
-        result_text = ""
-        for sel in [
-            ".modal-body table",
-            "[class*='InnerCalculator'] table",
-            ".modal-body .result",
-            "[class*='premiumResult']",
-            ".modal-body",
-        ]:
-            try:
-                txt = await page.inner_text(sel)
-                if txt and len(txt.strip()) > 20:
-                    result_text = txt.strip()
-                    break
-            except Exception:
-                continue
+        try:
+            await page.locator(SEL_RESULT).first.wait_for(state="visible", timeout=10000)
+        except Exception:
+            logger.warning("Result table did not appear — reading the modal as is")
+        try:
+            result_text = await page.evaluate(_RESULT_TEXT_JS, RESULT_SELECTORS)
+        except Exception:
+            result_text = ""
 
         if result_text:
             logger.section("Premium Calculation Result")
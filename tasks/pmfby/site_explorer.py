@@ -7,14 +7,15 @@ Many internal "links" are React card triggers (JS events), so the real crawlable
 pages are the traditional href-based ones listed in footer and nav.
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 import asyncio
+import re
+import time
 from collections import deque
+from functools import lru_cache
 from urllib.parse import urlparse
 
+from playwright.async_api import Page
+
 from shared.browser.controller import Browser
 from shared.utils import logger
 from shared.utils.helpers import save_json, display_table
@@ -38,6 +39,51 @@ KNOWN_PAGES = [
     "/compendium-files",
 ]
 
+# Links never worth a visit: downloads, JS handlers, bare anchors and the
+# separate SPAs (KRPH, LMS, YES-TECH, WINDS, CROPIC)
+_SKIP_LINK_RE = re.compile(
+    r"\.(?:pdf|jpg|png|zip|doc)$|javascript:|#$|/(?:krph|lms|yestech|winds|cropic)/"
+)
+
+@lru_cache(maxsize=4096)
+def _normalized(url: str) -> str:
+    """
+    scheme://host/path of url, trailing slash dropped ("" if unparsable).
+    Cached: the nav and footer links repeat on every crawled page.
+    """
+    try:
+        parsed = urlparse(url)
+        path = parsed.path.rstrip("/") or "/"
+        return f"{parsed.scheme}://{parsed.netloc}{path}"
+    except Exception:
+        return ""
+
+
+# FAQ (question, answer) selector pairs, tried in order: accordion/panel
+# patterns first, bare headings last
+FAQ_SELECTOR_PAIRS = [
+    (".panel-title", ".panel-body"),
+    (".accordion-button, .accordion-header", ".accordion-body, .accordion-collapse"),
+    (".faq-question", ".faq-answer"),
+    ("dt", "dd"),
+    ("h4, h5", "p"),
+]
+
+# Texts of the first selector pair with any question on the page, or the
+# main content's text when none match: one evaluate instead of two
+# get_all_text() calls per pair
+_FAQ_TEXT_JS = """
+(pairs) => {
+    const texts = (sel) => Array.from(document.querySelectorAll(sel), el => el.innerText);
+    for (const [q, a] of pairs) {
+        const questions = texts(q);
+        if (questions.length) return {questions, answers: texts(a), body: ''};
+    }
+    const main = document.querySelector('main, .content, body');
+    return {questions: [], answers: [], body: main ? main.innerText : ''};
+}
+"""
+
 
 class SiteExplorerTask:
     """BFS exploration of PMFBY site to build a structured sitemap."""
@@ -45,12 +91,44 @@ class SiteExplorerTask:
     BASE_DOMAIN = "pmfby.gov.in"
     MAX_DEPTH = 2
     MAX_PAGES = 20  # conservative to avoid overloading the server
+    PAGE_CACHE_TTL = 300  # seconds a visited page's title and links are reused
+    CRAWL_TABS = 4  # pages fetched at once; each still waits out navigate_delay
+    # Site-relative, or absolute with BASE_DOMAIN in the host part
+    _INTERNAL_RE = re.compile(rf"/|[^:/?#]+://[^/?#]*{re.escape(BASE_DOMAIN)}")
 
     def __init__(self, browser: Browser, verbose: bool = False):
         self.browser = browser
         self.verbose = verbose
         self.visited = set()
         self.sitemap = []
+        # normalized URL → (visited at, page_info, links), kept across runs
+        self._page_cache: dict[str, tuple[float, dict, list[dict]]] = {}
+
+    async def _visit(self, url: str, page: Page | None = None) -> tuple[dict, list[dict]]:
+        """
+        Navigate to url (in the given tab, else the main page) and return
+        (page_info, links). A page visited within PAGE_CACHE_TTL seconds is
+        served from the cache without navigating.
+        """
+        key = self._normalize_url(url)
+        cached = self._page_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.PAGE_CACHE_TTL:
+            logger.debug(f"  Cached: {url}", self.verbose)
+            return cached[1], cached[2]
+
+        await self.browser.navigate(url, page=page)
+        # Only the title and hrefs are read: wait for the first link to
+        # render, not for network idle, which background polling keeps away
+        try:
+            await (page or self.browser.page).locator("a[href]").first.wait_for(
+                state="attached", timeout=3000
+            )
+        except Exception:
+            logger.debug(f"  No links rendered on {url} — reading it as is", self.verbose)
+        page_info = await self.browser.get_page_info(page)
+        links = await self.browser.get_all_links(page)
+        self._page_cache[key] = (time.monotonic(), page_info, links)
+        return page_info, links
 
     async def explore(self, **kwargs) -> dict:
         """
@@ -61,73 +139,82 @@ class SiteExplorerTask:
         logger.info(f"Max depth: {self.MAX_DEPTH} | Max pages: {self.MAX_PAGES}")
         logger.info("Starting from known key pages + BFS discovery.\n")
 
-        # Seed queue with known pages
+        # Each run builds a fresh sitemap; only the page cache carries over
+        self.visited = set()
+        self.sitemap = []
+
+        # Seed queue with the homepage, then the known pages one level down,
+        # so they share the BFS rounds and the MAX_PAGES budget
         start_url = "https://pmfby.gov.in/"
         queue = deque([(start_url, 0)])
         self.visited.add(self._normalize_url(start_url))
+        for path in KNOWN_PAGES:
+            full_url = f"https://pmfby.gov.in{path}"
+            normalized = self._normalize_url(full_url)
+            if normalized not in self.visited:
+                self.visited.add(normalized)
+                queue.append((full_url, 1))
+
+        # The main page plus extra tabs in the same context; one URL each
+        # per round
+        tabs = [self.browser.page]
+        try:
+            for _ in range(self.CRAWL_TABS - 1):
+                tabs.append(await self.browser.open_page())
+        except Exception as e:
+            logger.debug(f"Could not open extra tabs ({e}) — crawling with {len(tabs)}", self.verbose)
 
-        while queue and len(self.sitemap) < self.MAX_PAGES:
-            url, depth = queue.popleft()
-            if depth > self.MAX_DEPTH:
-                continue
-
-            try:
-                await self.browser.navigate(url)
-                await self.browser.wait_for_network_idle(timeout=6000)
-
-                page_info = await self.browser.get_page_info()
-                links = await self.browser.get_all_links()
-
-                # Filter to real internal HREF links (not JS event handlers)
-                internal_links = [
-                    l for l in links
-                    if self._is_crawlable(l.get("href", ""))
-                ]
-
-                entry = {
-                    "url": page_info["url"],
-                    "title": page_info["title"][:80],
-                    "depth": depth,
-                    "links_found": len(internal_links),
-                }
-                self.sitemap.append(entry)
-                logger.success(
-                    f"[Depth {depth}] {page_info['title'][:50]} "
-                    f"— {len(internal_links)} links"
+        try:
+            while queue and len(self.sitemap) < self.MAX_PAGES:
+                batch = []
+                while queue and len(batch) < min(len(tabs), self.MAX_PAGES - len(self.sitemap)):
+                    url, depth = queue.popleft()
+                    if depth <= self.MAX_DEPTH:
+                        batch.append((url, depth))
+
+                results = await asyncio.gather(
+                    *(self._visit(url, tab) for (url, _), tab in zip(batch, tabs)),
+                    return_exceptions=True,
                 )
 
-                if depth < self.MAX_DEPTH:
-                    for link in internal_links:
-                        normalized = self._normalize_url(link.get("href", ""))
-                        if normalized and normalized not in self.visited:
-                            self.visited.add(normalized)
-                            queue.append((link["href"], depth + 1))
-
-            except Exception as e:
-                logger.warning(f"  Skipping {url}: {e}")
-                continue
-
-        # Also add known pages not yet visited
-        if len(self.sitemap) < self.MAX_PAGES:
-            for path in KNOWN_PAGES:
-                full_url = f"https://pmfby.gov.in{path}"
-                normalized = self._normalize_url(full_url)
-                if normalized not in self.visited:
-                    self.visited.add(normalized)
-                    try:
-                        await self.browser.navigate(full_url)
-                        await asyncio.sleep(2)
-                        page_info = await self.browser.get_page_info()
-                        self.sitemap.append({
-                            "url": page_info["url"],
-                            "title": page_info["title"][:80],
-                            "depth": 1,
-                            "links_found": 0,
-                            "source": "known_pages",
-                        })
-                        logger.success(f"[Known] {page_info['title'][:50]}")
-                    except Exception as e:
-                        logger.warning(f"  Could not fetch {full_url}: {e}")
+                # Merged in queue order, so the sitemap and BFS order match a
+                # serial crawl; nothing awaits here, so visited needs no lock
+                for (url, depth), result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        logger.warning(f"  Skipping {url}: {result}")
+                        continue
+                    page_info, links = result
+
+                    # Filter to real internal HREF links (not JS event handlers)
+                    internal_links = [
+                        l for l in links
+                        if self._is_crawlable(l.get("href", ""))
+                    ]
+
+                    entry = {
+                        "url": page_info["url"],
+                        "title": page_info["title"][:80],
+                        "depth": depth,
+                        "links_found": len(internal_links),
+                    }
+                    self.sitemap.append(entry)
+                    logger.success(
+                        f"[Depth {depth}] {page_info['title'][:50]} "
+                        f"— {len(internal_links)} links"
+                    )
+
+                    if depth < self.MAX_DEPTH:
+                        for link in internal_links:
+                            normalized = self._normalize_url(link.get("href", ""))
+                            if normalized and normalized not in self.visited:
+                                self.visited.add(normalized)
+                                queue.append((link["href"], depth + 1))
+        finally:
+            for tab in tabs[1:]:
+                try:
+                    await tab.close()
+                except Exception:
+                    pass
 
         logger.section("Sitemap Results")
         display_table(self.sitemap, title=f"Discovered {len(self.sitemap)} pages")
@@ -159,30 +246,22 @@ class SiteExplorerTask:
         faq_items = []
         page = self.browser.page
 
-        # Try accordion/panel patterns
-        selectors_pairs = [
-            (".panel-title", ".panel-body"),
-            (".accordion-button, .accordion-header", ".accordion-body, .accordion-collapse"),
-            (".faq-question", ".faq-answer"),
-            ("dt", "dd"),
-            ("h4, h5", "p"),
-        ]
-
-        for q_sel, a_sel in selectors_pairs:
-            questions = await self.browser.get_all_text(q_sel)
-            answers = await self.browser.get_all_text(a_sel)
-            if questions:
-                for i, q in enumerate(questions):
-                    a = answers[i] if i < len(answers) else ""
-                    faq_items.append({
-                        "question": q.strip()[:200],
-                        "answer": a.strip()[:500],
-                    })
-                break
+        try:
+            found = await page.evaluate(_FAQ_TEXT_JS, FAQ_SELECTOR_PAIRS)
+        except Exception as e:
+            logger.warning(f"Could not read FAQ content: {e}")
+            found = {"questions": [], "answers": [], "body": ""}
+
+        questions, answers = found["questions"], found["answers"]
+        for i, q in enumerate(questions):
+            a = answers[i] if i < len(answers) else ""
+            faq_items.append({
+                "question": q.strip()[:200],
+                "answer": a.strip()[:500],
+            })
 
         if not faq_items:
-            body = await self.browser.get_text("main, .content, body")
-            faq_items.append({"question": "FAQ Page", "answer": body[:2000]})
+            faq_items.append({"question": "FAQ Page", "answer": found["body"][:2000]})
 
         logger.success(f"Extracted {len(faq_items)} FAQ items")
         try:
@@ -194,26 +273,12 @@ class SiteExplorerTask:
 
     def _normalize_url(self, url: str) -> str:
         """Normalize URL for deduplication."""
-        try:
-            parsed = urlparse(url)
-            path = parsed.path.rstrip("/") or "/"
-            return f"{parsed.scheme}://{parsed.netloc}{path}"
-        except Exception:
-            return ""
+        return _normalized(url)
 
     def _is_crawlable(self, url: str) -> bool:
-        """Check if URL is a real internal page (not JS event or external)."""
-        try:
-            parsed = urlparse(url)
-            if self.BASE_DOMAIN not in parsed.netloc and not url.startswith("/"):
-                return False
-            # Skip anchors, downloads, external subdomains that are separate apps
-            if any(url.endswith(ext) for ext in (".pdf", ".jpg", ".png", ".zip", ".doc")):
-                return False
-            if "javascript:" in url or url.endswith("#") or url == "":
-                return False
-            if any(sub in url for sub in ["/krph/", "/lms/", "/yestech/", "/winds/", "/cropic/"]):
-                return False  # Separate SPAs — don't crawl
-            return True
-        except Exception:
-            return False
+        """
+        Check if URL is a real internal page (not JS event or external).
+        Runs for every link on every page, so it is two precompiled regex
+        checks rather than a urlparse().
+        """
+        return bool(url) and bool(self._INTERNAL_RE.match(url)) and not _SKIP_LINK_RE.search(url)
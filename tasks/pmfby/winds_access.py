@@ -10,15 +10,11 @@ KEY FINDINGS:
 - Nav: Home, Weather Information, Documents, Gallery, External Links, About Us
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 import asyncio
 
 from shared.browser.controller import Browser
 from shared.utils import logger
-from shared.utils.helpers import prompt_user, prompt_confirm
+from shared.utils.helpers import prompt_user_async
 
 WINDS_URL = "https://pmfby.gov.in/winds/"
 
@@ -130,7 +126,7 @@ class WINDSAccessTask:
         mobile = (
             pre_params.get("winds_mobile")
             or pre_params.get("mobile")
-            or prompt_user("WINDS Registered Mobile Number")
+            or await prompt_user_async("WINDS Registered Mobile Number")
         )
         if mobile:
             await self.browser.vision_fill(
@@ -140,7 +136,7 @@ class WINDSAccessTask:
             )
 
         # Password
-        password = pre_params.get("winds_password") or prompt_user("WINDS Password")
+        password = pre_params.get("winds_password") or await prompt_user_async("WINDS Password")
         if password:
             await self.browser.vision_fill(
                 "input[name='password'], input[type='password']",
@@ -159,11 +155,11 @@ class WINDSAccessTask:
         await asyncio.sleep(5)
         await self.browser.screenshot("winds_login_result")
 
-        body = await self.browser.get_text("body")
+        body = await self.browser.get_text_preview(400)
         return {
             "task": "winds_access",
             "action": "login",
             "mobile": mobile or "",
             "status": "completed",
-            "result_preview": body[:400] if body else "See winds_login_result.png",
+            "result_preview": body or "See winds_login_result.png",
         }
@@ -11,18 +11,21 @@ KEY FINDINGS:
 - Limitation: Agent cannot authenticate without departmental credentials
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
-import asyncio
-
 from shared.browser.controller import Browser
 from shared.utils import logger
 
 YESTECH_URL   = "https://pmfby.gov.in/yestech/"
 YESTECH_LOGIN = "https://pmfby.gov.in/yestech/signin"
 
+# Title and non-empty h1-h3 texts of the portal page in one evaluate
+_PAGE_STATE_JS = """
+() => ({
+    title: document.title,
+    headings: Array.from(document.querySelectorAll('h1, h2, h3'), h => h.innerText.trim())
+        .filter(Boolean),
+})
+"""
+
 
 class YESTECHAccessTask:
     """
@@ -50,16 +53,19 @@ class YESTECHAccessTask:
         page = self.browser.page
 
         # Navigate to the main portal
+        # The splash screen settles once its requests finish; no fixed 5 s pad
         await self.browser.navigate(YESTECH_URL)
-        await asyncio.sleep(5)
+        await self.browser.wait_for_network_idle(timeout=5000)
 
         current_url = page.url
-        title = await page.title()
 
-        # Try to read any public visible content
-        body_text = await self.browser.get_text("body")
-        headings   = await self.browser.get_all_text("h1, h2, h3")
-        headings   = [h.strip() for h in headings if h.strip()]
+        # Any public visible content: the headings are all that is reported
+        try:
+            state = await page.evaluate(_PAGE_STATE_JS)
+        except Exception as e:
+            logger.debug(f"Could not read portal headings: {e}", self.verbose)
+            state = {"title": "", "headings": []}
+        title, headings = state["title"], state["headings"]
 
         await self.browser.screenshot("yestech_portal")
 
@@ -95,11 +101,11 @@ class YESTECHAccessTask:
                 if await signin_link.count() > 0:
                     logger.info("Sign-in link found — navigating to it")
                     await signin_link.first.click()
-                    await asyncio.sleep(3)
+                    await self.browser.wait_for_network_idle(timeout=3000)
                     await self.browser.screenshot("yestech_signin_page")
             except Exception:
                 await self.browser.navigate(YESTECH_LOGIN)
-                await asyncio.sleep(3)
+                await self.browser.wait_for_network_idle(timeout=3000)
                 await self.browser.screenshot("yestech_signin_page")
 
         return {
@@ -9,20 +9,15 @@ Key findings:
   - Applications via banks/financial institutions, not directly via the portal
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 import asyncio
-from pathlib import Path
-
-import requests
 
-from shared.browser.controller import Browser, BASE_URL
+from shared.browser.controller import Browser
+from shared.config.pmkisan import PMKISAN_CONFIG
 from shared.utils import logger
 from shared.utils.helpers import prompt_confirm
 
 
+BASE_URL = PMKISAN_CONFIG.base_url
 AIF_GUIDELINES_URL = (
     f"{BASE_URL}/Documents/Operational%20Guidelines%20of%20Financing%20Facility"
     f"%20under%20Agriculture%20Infrastructure%20Fund.pdf"
@@ -75,7 +70,7 @@ class AIFAccessTask:
 
         # Download guidelines
         logger.step("Downloading AIF Operational Guidelines PDF...")
-        guidelines_path = await self._download_pdf(
+        guidelines_path = await self.browser.download_file(
             AIF_GUIDELINES_URL, "output/aif_operational_guidelines.pdf"
         )
 
@@ -87,30 +82,3 @@ class AIFAccessTask:
             "aif_portal": "https://agriinfra.dac.gov.in",
             "status": "completed",
         }
-
-    async def _download_pdf(self, url: str, dest: str) -> str:
-        """Download a PDF from `url`, save to `dest`, return path."""
-        try:
-            logger.info(f"Downloading: {url}")
-            headers = {
-                "User-Agent": (
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                )
-            }
-            response = requests.get(url, headers=headers, timeout=60)
-            response.raise_for_status()
-
-            dest_path = Path(dest)
-            dest_path.parent.mkdir(parents=True, exist_ok=True)
-            dest_path.write_bytes(response.content)
-
-            size_kb = len(response.content) // 1024
-            logger.success(f"Downloaded ({size_kb} KB): {dest_path.resolve()}")
-            return str(dest_path.resolve())
-
-        except Exception as e:
-            logger.error(f"Download failed for {url}: {e}")
-            logger.info(f"You can manually access the PDF at:\n  {url}")
-            return ""
@@ -15,18 +15,41 @@ dropdowns are populated before interacting with them.
 No CAPTCHA on this page — fully automatable.
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 import asyncio
 import json
 from pathlib import Path
 
 from shared.browser.controller import Browser
 from shared.utils import logger
-from shared.utils.helpers import prompt_user, prompt_confirm, save_json
-
+from shared.utils.helpers import prompt_user_async, save_json
+
+
+# Rows of the first <table> with a header row of 2+ cells and at least one
+# 2+ cell data row, as {header (or col_<i> past the headers): text} dicts.
+# Walked in the page: one evaluate instead of an inner_text() per cell.
+_TABLE_ROWS_JS = """
+() => {
+    const text = (cell) => cell.innerText.trim();
+    for (const table of document.querySelectorAll('table')) {
+        const rows = table.querySelectorAll('tr');
+        if (rows.length < 2) continue;
+        const headers = Array.from(rows[0].querySelectorAll('th, td'), text);
+        if (headers.length < 2) continue;
+        const data = [];
+        for (let r = 1; r < rows.length; r++) {
+            const cells = rows[r].querySelectorAll('td');
+            if (cells.length < 2) continue;
+            const row = {};
+            cells.forEach((cell, i) => {
+                row[i < headers.length ? headers[i] : 'col_' + i] = text(cell);
+            });
+            data.push(row);
+        }
+        if (data.length) return data;
+    }
+    return [];
+}
+"""
 
 class BeneficiaryListTask:
     """Fetches the beneficiary list by geographical location."""
@@ -54,7 +77,7 @@ class BeneficiaryListTask:
 
         # ── Step 1: State ─────────────────────────────────────────────────
         logger.step("Step 1: Select State")
-        state = pre_params.get("state") or prompt_user("State (e.g., Maharashtra)")
+        state = pre_params.get("state") or await prompt_user_async("State (e.g., Maharashtra)")
 
         try:
             await self.browser.select_option("#ContentPlaceHolder1_DropDownState", label=state)
@@ -68,7 +91,7 @@ class BeneficiaryListTask:
 
         # ── Step 2: District ─────────────────────────────────────────────
         logger.step("Step 2: Enter District")
-        district = pre_params.get("district") or prompt_user("District")
+        district = pre_params.get("district") or await prompt_user_async("District")
         if district:
             # Try select then fallback to fill
             filled = False
@@ -91,7 +114,7 @@ class BeneficiaryListTask:
         sub_district = (
             pre_params.get("sub_district")
             or pre_params.get("subdistrict")
-            or prompt_user("Sub-District / Tehsil (or press Enter to skip)")
+            or await prompt_user_async("Sub-District / Tehsil (or press Enter to skip)")
         )
         if sub_district:
             try:
@@ -107,7 +130,7 @@ class BeneficiaryListTask:
 
         # ── Step 4: Block ─────────────────────────────────────────────────
         logger.step("Step 4: Enter Block / Mandal")
-        block = pre_params.get("block") or prompt_user("Block / Mandal (or press Enter to skip)")
+        block = pre_params.get("block") or await prompt_user_async("Block / Mandal (or press Enter to skip)")
         if block:
             try:
                 await self.browser.select_option(
@@ -122,7 +145,7 @@ class BeneficiaryListTask:
 
         # ── Step 5: Village ───────────────────────────────────────────────
         logger.step("Step 5: Enter Village")
-        village = pre_params.get("village") or prompt_user("Village (or press Enter to skip)")
+        village = pre_params.get("village") or await prompt_user_async("Village (or press Enter to skip)")
         if village:
             try:
                 await self.browser.select_option(
@@ -191,35 +214,7 @@ class BeneficiaryListTask:
         page = self.browser.page
 
         try:
-            # Find the main data table
-            tables = await page.query_selector_all("table")
-            for table in tables:
-                rows = await table.query_selector_all("tr")
-                if len(rows) < 2:
-                    continue
-
-                headers = []
-                header_row = rows[0]
-                header_cells = await header_row.query_selector_all("th, td")
-                for cell in header_cells:
-                    headers.append((await cell.inner_text()).strip())
-
-                if not headers or len(headers) < 2:
-                    continue
-
-                data_rows = []
-                for row in rows[1:]:
-                    cells = await row.query_selector_all("td")
-                    if len(cells) >= 2:
-                        row_data = {}
-                        for idx, cell in enumerate(cells):
-                            key = headers[idx] if idx < len(headers) else f"col_{idx}"
-                            row_data[key] = (await cell.inner_text()).strip()
-                        data_rows.append(row_data)
-
-                if data_rows:
-                    return data_rows
-
+            return await page.evaluate(_TABLE_ROWS_JS)
         except Exception as e:
             logger.warning(f"Table extraction failed: {e}")
 
@@ -13,15 +13,11 @@ Live selectors (verified 2026-02-21 on /Grievance.aspx):
 IMPORTANT: All radio button IDs include the ContentPlaceHolder1_ prefix.
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 import asyncio
 
 from shared.browser.controller import Browser
 from shared.utils import logger
-from shared.utils.helpers import prompt_user, prompt_confirm
+from shared.utils.helpers import prompt_user_async, prompt_confirm_async
 
 
 class HelpdeskTask:
@@ -60,13 +56,13 @@ class HelpdeskTask:
         mobile = pre_params.get("mobile") or ""
 
         if not registration_no and not mobile:
-            mode = prompt_user(
+            mode = await prompt_user_async(
                 "Search by Registration Number or Mobile? (reg/mobile)", default="reg"
             )
             if mode.strip().lower() == "mobile":
-                mobile = prompt_user("Mobile Number (10 digits)")
+                mobile = await prompt_user_async("Mobile Number (10 digits)")
             else:
-                registration_no = prompt_user("Registration Number")
+                registration_no = await prompt_user_async("Registration Number")
 
         # Select appropriate radio
         if mobile and not registration_no:
@@ -102,7 +98,7 @@ class HelpdeskTask:
         )
 
         # Step 5: Submit
-        if prompt_confirm("Submit the query after you fill the details?", default=False):
+        if await prompt_confirm_async("Submit the query after you fill the details?", default=False):
             await self.browser.handoff_to_user(
                 "Complete the query details, click Submit, then type 'continue'."
             )
@@ -149,17 +145,17 @@ class HelpdeskTask:
         mobile = pre_params.get("mobile") or ""
 
         if not registration_no and not mobile:
-            mode = prompt_user(
+            mode = await prompt_user_async(
                 "Search by Registration Number or Mobile? (reg/mobile)", default="reg"
             )
             if mode.strip().lower() == "mobile":
-                mobile = prompt_user("Mobile Number (10 digits)")
+                mobile = await prompt_user_async("Mobile Number (10 digits)")
                 try:
                     await self.browser.click("#ContentPlaceHolder1_rdbAction_1")
                 except Exception:
                     pass
             else:
-                registration_no = prompt_user("Registration Number")
+                registration_no = await prompt_user_async("Registration Number")
 
         input_value = registration_no or mobile
         await self.browser.vision_fill(
@@ -8,21 +8,15 @@ Key findings:
   - General info accessible via the homepage KCC section
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 import asyncio
-import os
-from pathlib import Path
-
-import requests
 
-from shared.browser.controller import Browser, BASE_URL
+from shared.browser.controller import Browser
+from shared.config.pmkisan import PMKISAN_CONFIG
 from shared.utils import logger
-from shared.utils.helpers import prompt_confirm
+from shared.utils.helpers import prompt_confirm_async
 
 
+BASE_URL = PMKISAN_CONFIG.base_url
 KCC_FORM_URL = f"{BASE_URL}/Documents/Kcc.pdf"
 KCC_CIRCULAR_URL = f"{BASE_URL}/Documents/finalKCCCircular.pdf"
 
@@ -41,8 +35,8 @@ class KCCAccessTask:
         Flow:
           1. Navigate to homepage, scroll to KCC section
           2. Extract KCC info text
-          3. Download KCC PDF form
-          4. Offer to download saturation campaign circular
+          3. Offer the saturation campaign circular as well
+          4. Download the KCC PDF form (and the circular, concurrently)
         """
         logger.section("Kisan Credit Card (KCC)")
         page = self.browser.page
@@ -73,16 +67,26 @@ class KCCAccessTask:
 
         await self.browser.screenshot("kcc_homepage_section")
 
-        # Download KCC form PDF
-        logger.step("Downloading KCC Application Form PDF...")
-        form_path = await self._download_pdf(KCC_FORM_URL, "output/kcc_application_form.pdf")
+        # Ask about the circular first so both PDFs can download together;
+        # download_file logs failures and returns "" instead of raising
+        want_circular = await prompt_confirm_async(
+            "Also download the KCC Saturation Campaign Circular?", default=False
+        )
 
-        # Offer circular download
+        logger.step("Downloading KCC Application Form PDF...")
+        form_download = self.browser.download_file(
+            KCC_FORM_URL, "output/kcc_application_form.pdf", timeout=30000
+        )
         circular_path = ""
-        if prompt_confirm("Also download the KCC Saturation Campaign Circular?", default=False):
-            circular_path = await self._download_pdf(
-                KCC_CIRCULAR_URL, "output/kcc_saturation_circular.pdf"
+        if want_circular:
+            form_path, circular_path = await asyncio.gather(
+                form_download,
+                self.browser.download_file(
+                    KCC_CIRCULAR_URL, "output/kcc_saturation_circular.pdf", timeout=30000
+                ),
             )
+        else:
+            form_path = await form_download
 
         return {
             "task": "access_kcc",
@@ -92,30 +96,3 @@ class KCCAccessTask:
             "kcc_form_url": KCC_FORM_URL,
             "status": "completed",
         }
-
-    async def _download_pdf(self, url: str, dest: str) -> str:
-        """Download a PDF from `url`, save to `dest`, return path."""
-        try:
-            logger.info(f"Downloading: {url}")
-            headers = {
-                "User-Agent": (
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                )
-            }
-            response = requests.get(url, headers=headers, timeout=30)
-            response.raise_for_status()
-
-            dest_path = Path(dest)
-            dest_path.parent.mkdir(parents=True, exist_ok=True)
-            dest_path.write_bytes(response.content)
-
-            size_kb = len(response.content) // 1024
-            logger.success(f"Downloaded ({size_kb} KB): {dest_path.resolve()}")
-            return str(dest_path.resolve())
-
-        except Exception as e:
-            logger.error(f"Download failed for {url}: {e}")
-            logger.info(f"You can manually download from: {url}")
-            return ""
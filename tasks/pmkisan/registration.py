@@ -18,13 +18,9 @@ Live selectors (verified 2026-02-21 on pmkisan.gov.in):
 import asyncio
 from playwright.async_api import Page
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 from shared.browser.controller import Browser
 from shared.utils import logger
-from shared.utils.helpers import prompt_user, prompt_confirm
+from shared.utils.helpers import prompt_user_async, prompt_confirm_async
 
 
 class FarmerRegistrationTask:
@@ -52,7 +48,7 @@ class FarmerRegistrationTask:
 
         # ── Step 1: Aadhaar ───────────────────────────────────────────────
         logger.step("Step 1: Enter Aadhaar Number")
-        aadhaar = pre_params.get("aadhaar") or prompt_user(
+        aadhaar = pre_params.get("aadhaar") or await prompt_user_async(
             "Aadhaar Number (12 digits)", secret=True
         )
         await self.browser.vision_fill(
@@ -62,7 +58,7 @@ class FarmerRegistrationTask:
 
         # ── Step 2: Mobile Number ─────────────────────────────────────────
         logger.step("Step 2: Enter Mobile Number")
-        mobile = pre_params.get("mobile") or prompt_user("Mobile Number (10 digits)")
+        mobile = pre_params.get("mobile") or await prompt_user_async("Mobile Number (10 digits)")
         await self.browser.vision_fill(
             "#ContentPlaceHolder1_txtMobileNo", mobile,
             "the Mobile Number input field"
@@ -70,7 +66,7 @@ class FarmerRegistrationTask:
 
         # ── Step 3: Select State ──────────────────────────────────────────
         logger.step("Step 3: Select State")
-        state = pre_params.get("state") or prompt_user(
+        state = pre_params.get("state") or await prompt_user_async(
             "State (e.g., Maharashtra, Rajasthan)"
         )
         try:
@@ -148,7 +144,7 @@ class FarmerRegistrationTask:
         )
 
         # ── Step 7: Confirm & submit ───────────────────────────────────────
-        if prompt_confirm("Do you want the agent to submit the registration form?", default=False):
+        if await prompt_confirm_async("Do you want the agent to submit the registration form?", default=False):
             await self.browser.handoff_to_user(
                 "Please review all form fields, then click the Submit button. "
                 "After submission, type 'continue'."
@@ -187,7 +183,7 @@ class FarmerRegistrationTask:
 
         # Step 1: Aadhaar
         logger.step("Step 1: Enter Aadhaar for lookup")
-        aadhaar = pre_params.get("aadhaar") or prompt_user(
+        aadhaar = pre_params.get("aadhaar") or await prompt_user_async(
             "Aadhaar Number (12 digits)", secret=True
         )
         await self.browser.vision_fill(
@@ -221,7 +217,7 @@ class FarmerRegistrationTask:
         else:
             logger.warning("Could not auto-extract record — check the browser window.")
 
-        if prompt_confirm("Do you want to edit/update the record in the browser?", default=True):
+        if await prompt_confirm_async("Do you want to edit/update the record in the browser?", default=True):
             await self.browser.handoff_to_user(
                 "Please make the required edits in the form, then submit. "
                 "Type 'continue' when done."
@@ -3,10 +3,6 @@ SiteExplorerTask — BFS crawler for pmkisan.gov.in.
 Explores up to a configurable depth and outputs a JSON sitemap.
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 import asyncio
 import json
 from collections import deque
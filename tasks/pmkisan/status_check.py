@@ -25,16 +25,12 @@ Live selectors (verified 2026-02-21 on pmkisan.gov.in):
     Get OTP button:          #ContentPlaceHolder1_btnMobileOtp
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-
 import asyncio
 from playwright.async_api import Page
 
 from shared.browser.controller import Browser
 from shared.utils import logger
-from shared.utils.helpers import prompt_user, prompt_confirm
+from shared.utils.helpers import prompt_user_async
 
 
 class StatusCheckTask:
@@ -59,7 +55,7 @@ class StatusCheckTask:
                 "No registration number provided.\n"
                 "Tip: Use 'know_registration_number' intent to find it first."
             )
-            registration_no = prompt_user(
+            registration_no = await prompt_user_async(
                 "Enter your Registration Number (or press Enter to skip and use "
                 "the 'Know Your Registration Number' link in the browser)"
             )
@@ -111,7 +107,7 @@ class StatusCheckTask:
         page = self.browser.page
 
         # Aadhaar
-        aadhaar = pre_params.get("aadhaar") or prompt_user(
+        aadhaar = pre_params.get("aadhaar") or await prompt_user_async(
             "Aadhaar Number (12 digits)", secret=True
         )
         await self.browser.vision_fill(
@@ -163,12 +159,12 @@ class StatusCheckTask:
         by_mobile = bool(mobile) or not bool(aadhaar)
 
         if not mobile and not aadhaar:
-            mode = prompt_user("Search by Mobile or Aadhaar? (mobile/aadhaar)", default="mobile")
+            mode = await prompt_user_async("Search by Mobile or Aadhaar? (mobile/aadhaar)", default="mobile")
             by_mobile = mode.strip().lower() != "aadhaar"
             if by_mobile:
-                mobile = prompt_user("Mobile Number (10 digits)")
+                mobile = await prompt_user_async("Mobile Number (10 digits)")
             else:
-                aadhaar = prompt_user("Aadhaar Number (12 digits)", secret=True)
+                aadhaar = await prompt_user_async("Aadhaar Number (12 digits)", secret=True)
 
         # Select radio button
         radio_sel = "#rdlselection_0" if by_mobile else "#rdlselection_1"
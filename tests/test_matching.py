@@ -0,0 +1,126 @@
+"""
+Unit tests for the shared dropdown option matcher.
+Run: python -m pytest tests/test_matching.py -v
+"""
+
+import os
+import sys
+import unittest.mock as mock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shared.utils.matching as matching
+from shared.utils.matching import _acronym_of, smart_match
+
+
+SCHEMES = ["Pradhan Mantri Fasal Bima Yojana", "Weather Based Crop Insurance Scheme"]
+CROPS = ["Paddy", "Wheat", "Maize (Rabi)", "Cotton", "Bajra"]
+
+
+class TestAcronym:
+    def test_initials_match(self):
+        assert _acronym_of("PMFBY", "Pradhan Mantri Fasal Bima Yojana")
+
+    def test_case_insensitive(self):
+        assert _acronym_of("pmfby", "Pradhan Mantri Fasal Bima Yojana")
+
+    def test_mismatch(self):
+        assert not _acronym_of("WBCIS", "Pradhan Mantri Fasal Bima Yojana")
+
+
+@pytest.fixture(params=["rapidfuzz", "fallback"])
+def matcher(request):
+    """Run each matcher test with and without the optional RapidFuzz pass."""
+    if request.param == "rapidfuzz":
+        pytest.importorskip("rapidfuzz")
+        yield request.param
+    else:
+        with mock.patch.object(matching, "process", None):
+            yield request.param
+
+
+@pytest.mark.usefixtures("matcher")
+class TestSmartMatch:
+    def test_exact_ignores_case_and_whitespace(self):
+        assert smart_match(" wheat ", CROPS) == "Wheat"
+
+    def test_exact_beats_earlier_partial(self):
+        assert smart_match("Rabi", ["Maize (Rabi)", "Rabi"]) == "Rabi"
+
+    def test_exact_duplicates_return_first(self):
+        assert smart_match("paddy", ["Paddy", "PADDY"]) == "Paddy"
+
+    def test_partial_label_in_option(self):
+        assert smart_match("maize", CROPS) == "Maize (Rabi)"
+
+    def test_partial_option_in_label(self):
+        assert smart_match("Kharif 2025", ["Rabi", "Kharif"]) == "Kharif"
+
+    def test_acronym(self):
+        assert smart_match("PMFBY", SCHEMES) == "Pradhan Mantri Fasal Bima Yojana"
+
+    def test_lowercase_acronym(self):
+        assert smart_match("pmfby", SCHEMES) == "Pradhan Mantri Fasal Bima Yojana"
+
+    def test_token_overlap(self):
+        assert smart_match("crop weather cover", SCHEMES) == "Weather Based Crop Insurance Scheme"
+
+    def test_no_match(self):
+        assert smart_match("Sugarcane", CROPS) is None
+
+    @pytest.mark.parametrize("label, options", [
+        ("Tomato", ["Potato", "Onion"]),
+        ("Mango", ["Moong", "Urad"]),
+        ("Garlic", ["Gram", "Jowar"]),
+        ("Ginger", ["Ragi", "Bajra"]),
+        ("Delhi", ["Uttar Pradesh", "Haryana"]),
+        ("Raigad", ["Raigarh", "Raipur"]),
+        ("2026", ["2024", "2025"]),
+    ])
+    def test_value_not_listed(self, label, options):
+        assert smart_match(label, options) is None
+
+    def test_empty_options(self):
+        assert smart_match("Paddy", []) is None
+
+    def test_typo_with_rapidfuzz(self, matcher):
+        if matcher != "rapidfuzz":
+            pytest.skip("typo tolerance needs rapidfuzz")
+        assert smart_match("Maharastra", ["Manipur", "Maharashtra"]) == "Maharashtra"
+
+    def test_ambiguous_typo_is_rejected(self, matcher):
+        if matcher != "rapidfuzz":
+            pytest.skip("typo tolerance needs rapidfuzz")
+        assert smart_match("Sonpur", ["Sonepur", "Sonipur"]) is None
+
+
+def _fake_metaphone(word):
+    """Crude stand-in sound code: consonants only, 'dh' heard as 'd'."""
+    consonants = "".join(c for c in word.lower().replace("dh", "d") if c.isalpha() and c not in "aeiou")
+    return consonants[:4], ""
+
+
+class TestPhoneticMatch:
+    @pytest.fixture(autouse=True)
+    def _phonetic(self):
+        with mock.patch.object(matching, "doublemetaphone", _fake_metaphone), \
+                mock.patch.object(matching, "process", None):
+            matching._phonetic_index.cache_clear()
+            yield
+        matching._phonetic_index.cache_clear()
+
+    def test_unique_code_matches(self):
+        assert smart_match("Madhurai", ["Mathura", "Madurai"]) == "Madurai"
+
+    def test_shared_code_is_ignored(self):
+        assert smart_match("Kshngnj", ["Kishanganj", "Kishangarh"]) is None
+
+    def test_same_sound_different_spelling_is_ignored(self):
+        assert smart_match("Mango", ["Moong", "Urad"]) is None
+
+    def test_real_metaphone(self):
+        metaphone = pytest.importorskip("metaphone")
+        with mock.patch.object(matching, "doublemetaphone", metaphone.doublemetaphone):
+            assert smart_match("Bajara", CROPS) == "Bajra"
@@ -0,0 +1,115 @@
+"""
+Unit tests for tasks/pmfby/premium_calculator.py
+Run: python -m pytest tests/test_premium_calculator.py -v
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tasks.pmfby.premium_calculator import PremiumCalculatorTask, SEL_AREA, _param_text
+
+
+class _FakeLocator:
+    @property
+    def last(self):
+        return self
+
+    @property
+    def first(self):
+        return self
+
+    async def wait_for(self, **kwargs):
+        pass
+
+    async def click(self):
+        pass
+
+
+class _FakePage:
+    def __init__(self):
+        self.fills = {}
+
+    def locator(self, selector):
+        return _FakeLocator()
+
+    async def fill(self, selector, value):
+        if not isinstance(value, str):
+            raise TypeError(f"value: expected string, got {type(value).__name__}")
+        self.fills[selector] = value
+
+    async def evaluate(self, *args):
+        return "Premium payable: 1,234"
+
+
+class _FakeBrowser:
+    async def screenshot(self, name):
+        return name
+
+
+@pytest.fixture
+def task(monkeypatch):
+    task = PremiumCalculatorTask(_FakeBrowser())
+    task.picked = {}
+
+    async def select_and_load_next(page, idx, label, field_name, opts, next_idx):
+        task.picked[field_name] = label
+        return label, ["Option"]
+
+    async def select_required(page, idx, label, field_name, opts=None):
+        task.picked[field_name] = label
+        return label
+
+    async def ask(executor, question, options=None):
+        raise AssertionError(f"should not ask: {question}")
+
+    monkeypatch.setattr(task, "_select_and_load_next", select_and_load_next)
+    monkeypatch.setattr(task, "_select_required", select_required)
+    monkeypatch.setattr(task, "_ask_sahayak", ask)
+    return task
+
+
+class TestParamText:
+    def test_number(self):
+        assert _param_text(2025) == "2025"
+
+    def test_strips(self):
+        assert _param_text("  Kharif ") == "Kharif"
+
+    def test_unset(self):
+        assert _param_text(None) == ""
+
+
+class TestFillAndCalculate:
+    def test_numeric_params_are_used_as_text(self, task):
+        page = _FakePage()
+        params = {
+            "season": "Kharif", "year": 2025, "state": "Bihar",
+            "district": "Patna", "crop": "Paddy", "area": 5,
+        }
+        result = asyncio.run(task._fill_and_calculate(page, params, ["Kharif", "Rabi"]))
+        assert task.picked["Year"] == "2025"
+        assert page.fills[SEL_AREA] == "5"
+        assert result["year"] == "2025"
+        assert result["area_ha"] == "5"
+        assert result["status"] == "completed"
+
+    def test_blank_param_is_asked(self, task, monkeypatch):
+        asked = []
+
+        async def ask(executor, question, options=None):
+            asked.append(question)
+            return " 2024 "
+
+        monkeypatch.setattr(task, "_ask_sahayak", ask)
+        params = {
+            "season": "Kharif", "year": "  ", "state": "Bihar",
+            "district": "Patna", "crop": "Paddy", "area": 2,
+        }
+        asyncio.run(task._fill_and_calculate(_FakePage(), params, ["Kharif", "Rabi"]))
+        assert asked == ["Please pick a year."]
+        assert task.picked["Year"] == " 2024 "